@@ -1,17 +1,29 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, conint
 from typing import List, Optional
+import asyncio
 import sys
 import os
-import threading
-import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from engine.advisor import set_ev_cache_size
 from engine.game import BlackjackGame
+from engine.probability import set_dealer_cache_size
+from engine.cards import SUITS
 from engine.models import Card, BetHand
 from engine.enums import GameResult
+from engine.rules import RuleSet
+from backend.push import KEEPALIVE, KEEPALIVE_INTERVAL, sse_frame
+from backend.store import (
+    DEFAULT_IDLE_TTL, DEFAULT_MAX_ENTRIES, DEFAULT_REAP_INTERVAL,
+    GameEntry, GameStore, MemoryGameStore, SqliteGameStore,
+)
 
 app = FastAPI(title="Blackjack Game API")
 
@@ -24,28 +36,126 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-games = {}
-# Cache resolve responses to make /resolve idempotent (avoid double-applying payouts)
-_resolve_response_cache = {}
-# Per-game locks to avoid concurrent resolve executions
-_resolve_locks = {}
+def _create_store() -> GameStore:
+    # Games with their cached resolve response and resolve lock; idle and
+    # least recently used games are evicted so memory stays bounded
+    memory = MemoryGameStore(
+        max_entries=int(os.getenv("GAME_STORE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        idle_ttl=float(os.getenv("GAME_STORE_IDLE_TTL", DEFAULT_IDLE_TTL)),
+    )
+    # With a database path, games are also persisted and survive restarts
+    path = os.getenv("GAME_STORE_PATH")
+    if path:
+        return SqliteGameStore(path, cache=memory)
+    return memory
+
+store = _create_store()
+
+# Every table has its own unseen cards, so advice rarely hits the caches;
+# the API keeps them small instead of the engine's simulation-sized ones
+ADVICE_CACHE_SIZE = int(os.getenv("ADVICE_CACHE_SIZE", 1 << 14))
+# Advice is CPU-bound (milliseconds per cold query), so it runs off the event loop
+advice_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ADVICE_WORKERS", 2)), thread_name_prefix="advice"
+)
+
+# A client that picks the seed knows every card in advance, so replays by
+# seed are for debugging only
+ALLOW_CLIENT_SEEDS = os.getenv("ALLOW_CLIENT_SEEDS", "") == "1"
+
+@app.on_event("startup")
+async def start_store_reaper():
+    store.start_reaper(float(os.getenv("GAME_STORE_REAP_INTERVAL", DEFAULT_REAP_INTERVAL)))
+
+@app.on_event("startup")
+async def bound_advice_caches():
+    set_ev_cache_size(ADVICE_CACHE_SIZE)
+    set_dealer_cache_size(ADVICE_CACHE_SIZE)
+
+@app.on_event("shutdown")
+async def stop_store_reaper():
+    store.stop_reaper()
+    store.close()
+
+def _cached_entry(game_id: str) -> GameEntry:
+    entry = store.cached(game_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return entry
+
+async def _get_entry(game_id: str) -> GameEntry:
+    # A cache miss may read the database: keep that off the event loop
+    entry = store.cached(game_id)
+    if entry is None:
+        entry = await asyncio.to_thread(store.get, game_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return entry
+
+@asynccontextmanager
+async def _locked_entry(game_id: str):
+    """Holds the game's lock; an entry dropped by the store while we waited is fetched again."""
+    while True:
+        entry = await _get_entry(game_id)
+        async with entry.lock:
+            if not entry.closed:
+                yield entry
+                return
+
+# Seats, bets and names are bounded so every game fits its snapshot
+MAX_PLAYERS = 7
+MAX_BET = 1_000_000
+MAX_NAME_LENGTH = 40
 
 class PlayerInput(BaseModel):
-    name: str
-    bet: int
+    name: str = Field(min_length=1, max_length=MAX_NAME_LENGTH)
+    bet: int = Field(ge=1, le=MAX_BET)
+
+MAX_DECKS = 8
+
+class RulesInput(BaseModel):
+    # [numerator, denominator]
+    blackjack_payout: List[conint(ge=1, le=10)] = Field([3, 2], min_length=2, max_length=2)
+    dealer_hits_soft_17: bool = False
+    double_after_split: bool = True
+    # Two-card totals
+    double_on: Optional[List[conint(ge=2, le=21)]] = Field(None, max_length=20)
+    num_decks: int = Field(1, ge=1, le=MAX_DECKS)
+    penetration: float = Field(0.75, gt=0, le=1)
+    surrender: bool = False
+    insurance_payout: int = Field(2, ge=0, le=10)
+
+    def to_rules(self) -> RuleSet:
+        return RuleSet(
+            blackjack_payout=tuple(self.blackjack_payout),
+            dealer_hits_soft_17=self.dealer_hits_soft_17,
+            double_after_split=self.double_after_split,
+            double_on=None if self.double_on is None else tuple(self.double_on),
+            num_decks=self.num_decks,
+            penetration=self.penetration,
+            surrender=self.surrender,
+            insurance_payout=self.insurance_payout,
+        )
 
 class StartGameRequest(BaseModel):
-    players: List[PlayerInput]
+    players: List[PlayerInput] = Field(min_length=1, max_length=MAX_PLAYERS)
+    # Replays a previous round; the seed is only revealed by /resolve.
+    # Rejected unless ALLOW_CLIENT_SEEDS=1
+    seed: Optional[int] = None
+    rules: Optional[RulesInput] = None
 
 class ActionRequest(BaseModel):
     game_id: str
     player_index: int
     hand_index: int = 0
+    # Version of the client's state; if still current, only changes are returned
+    since_version: Optional[int] = None
 
 class InsuranceRequest(BaseModel):
     game_id: str
     player_index: int
-    amount: int
+    amount: int = Field(ge=0)
+    since_version: Optional[int] = None
 
 class GameStateResponse(BaseModel):
     game_id: str
@@ -54,11 +164,15 @@ class GameStateResponse(BaseModel):
     dealer_value: int
     current_player_index: Optional[int]
     game_over: bool
+    version: int
 
 def card_to_dict(card: Card):
-    suits = ['Hearts','Diamonds','Clubs' ,'Spades']
+    # Canonical cards know their suit; a fresh dict per card, so no response
+    # can change what another one returns
+    if card.suit:
+        return {"suit": card.suit, "value": card.value}
 
-    for suit_name in suits:
+    for suit_name in SUITS:
         if suit_name in card.name:
             return {"suit": suit_name, "value": card.value}
 
@@ -73,15 +187,19 @@ def bet_hand_to_dict(bet_hand: BetHand):
     return {
         "bet": bet_hand.bet,
         "doubled": bet_hand.doubled,
+        "surrendered": bet_hand.surrendered,
         "is_finished": bet_hand.is_finished,
         **hand_to_dict(bet_hand.hand)
     }
 
+def _all_finished(game: BlackjackGame) -> bool:
+    return all(
+        all(bh.is_finished for bh in player.hands)
+        for player in game.players
+    )
+
 def get_game_state(game_id: str, show_dealer_cards: bool = False):
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[game_id]
+    game = _cached_entry(game_id).game
     
     dealer_cards = game.dealer_hand.cards if show_dealer_cards else [game.dealer_hand.cards[0]]
     dealer_value = game.dealer_hand.value if show_dealer_cards else game.dealer_hand.cards[0].value
@@ -93,137 +211,189 @@ def get_game_state(game_id: str, show_dealer_cards: bool = False):
             "insurance_bet": player.insurance_bet
         } for player in game.players]
     
-    all_finished = all(
-        all(bh.is_finished for bh in player.hands)
-        for player in game.players
-    )
-    
     return GameStateResponse(
         game_id=game_id,
         players=players_data,
         dealer_hand=[card_to_dict(card) for card in dealer_cards],
         dealer_value=dealer_value,
         current_player_index=game.current_player_index,
-        game_over=all_finished
+        game_over=_all_finished(game),
+        version=game.version
     )
 
+def _render_state(game_id: str, show_dealer_cards: bool = False) -> bytes:
+    return json.dumps(get_game_state(game_id, show_dealer_cards).dict(), separators=(",", ":")).encode()
+
+def _commit(game_id: str, entry: GameEntry):
+    """Persists a changed game and pushes its new state to open event streams."""
+    try:
+        store.save(game_id, entry)
+    except ValueError:
+        # Nothing was reported yet: back to the last saved state, so the
+        # client never sees a move that wasn't kept
+        store.revert(game_id)
+        raise HTTPException(status_code=500, detail="Game could not be saved")
+    feed = entry.feed
+    if feed.subscribers:
+        # One render for the whole table; the dealer is revealed once all hands are done
+        game = entry.game
+        feed.publish(sse_frame(game.version, _render_state(game_id, _all_finished(game))))
+
+def _action_response(request, entry: GameEntry, before: int, first_hand: int, show_dealer_cards: bool = False):
+    """
+    State after a move by one player. A client whose since_version was the
+    version before the move gets only what the move changed: that player's
+    hands from `first_hand` on, the turn and, once revealed, the dealer.
+    Anyone else gets the full state.
+    """
+    if request.since_version is None or request.since_version != before:
+        return get_game_state(request.game_id, show_dealer_cards)
+
+    game = entry.game
+    player = game.players[request.player_index]
+    delta = {
+        "game_id": request.game_id,
+        "delta": True,
+        "since_version": before,
+        "version": game.version,
+        "players": [{
+            "index": request.player_index,
+            "balance": player.balance,
+            "insurance_bet": player.insurance_bet,
+            "hands_from": first_hand,
+            "hands": [bet_hand_to_dict(bh) for bh in player.hands[first_hand:]],
+        }],
+        "current_player_index": game.current_player_index,
+        "game_over": _all_finished(game),
+    }
+    if show_dealer_cards:
+        delta["dealer_hand"] = [card_to_dict(card) for card in game.dealer_hand.cards]
+        delta["dealer_value"] = game.dealer_hand.value
+    return Response(content=json.dumps(delta, separators=(",", ":")).encode(), media_type="application/json")
+
 @app.post("/api/game/start")
 async def start_game(request: StartGameRequest):
     import uuid
     game_id = str(uuid.uuid4())
     
+    if request.seed is not None and not ALLOW_CLIENT_SEEDS:
+        raise HTTPException(status_code=403, detail="Client seeds are disabled on this server")
+
     players = [(p.name, p.bet) for p in request.players]
-    game = BlackjackGame(players)
-    games[game_id] = game
+    try:
+        rules = request.rules.to_rules() if request.rules is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    game = BlackjackGame(players, seed=request.seed, rules=rules)
+    try:
+        store.add(game_id, game)
+    except ValueError as e:
+        await asyncio.to_thread(store.remove, game_id)
+        raise HTTPException(status_code=400, detail=str(e))
     
     return get_game_state(game_id)
 
 @app.post("/api/game/{game_id}/hit")
 async def hit(request: ActionRequest):
-    if request.game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[request.game_id]
-    player = game.players[request.player_index]
-    
-    try:
-        game.hit(player, request.hand_index)
-        return get_game_state(request.game_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    async with _locked_entry(request.game_id) as entry:
+        game = entry.game
+        player = game.players[request.player_index]
+
+        before = game.version
+        try:
+            game.hit(player, request.hand_index)
+            _commit(request.game_id, entry)
+            return _action_response(request, entry, before, request.hand_index)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/game/{game_id}/stand")
 async def stand(request: ActionRequest):
-    if request.game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[request.game_id]
-    player = game.players[request.player_index]
-    
-    try:
-        game.stand(player, request.hand_index)
-        
-        all_finished = all(
-            all(bh.is_finished for bh in p.hands)
-            for p in game.players
-        )
-        
-        show_dealer = all_finished
-        return get_game_state(request.game_id, show_dealer_cards=show_dealer)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    async with _locked_entry(request.game_id) as entry:
+        game = entry.game
+        player = game.players[request.player_index]
+
+        before = game.version
+        try:
+            game.stand(player, request.hand_index)
+            _commit(request.game_id, entry)
+            return _action_response(request, entry, before, request.hand_index, show_dealer_cards=_all_finished(game))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/game/{game_id}/double")
 async def double(request: ActionRequest):
-    if request.game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[request.game_id]
-    player = game.players[request.player_index]
-    
-    try:
-        game.double(player, request.hand_index)
-        return get_game_state(request.game_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    async with _locked_entry(request.game_id) as entry:
+        game = entry.game
+        player = game.players[request.player_index]
+
+        before = game.version
+        try:
+            game.double(player, request.hand_index)
+            _commit(request.game_id, entry)
+            return _action_response(request, entry, before, request.hand_index)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/game/{game_id}/split")
 async def split(request: ActionRequest):
-    if request.game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[request.game_id]
-    player = game.players[request.player_index]
-    
-    try:
-        game.split_hand(player, request.hand_index)
-        return get_game_state(request.game_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    async with _locked_entry(request.game_id) as entry:
+        game = entry.game
+        player = game.players[request.player_index]
+
+        before = game.version
+        try:
+            game.split_hand(player, request.hand_index)
+            _commit(request.game_id, entry)
+            return _action_response(request, entry, before, request.hand_index)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/game/{game_id}/surrender")
+async def surrender(request: ActionRequest):
+    async with _locked_entry(request.game_id) as entry:
+        game = entry.game
+        player = game.players[request.player_index]
+
+        before = game.version
+        try:
+            game.surrender(player, request.hand_index)
+            _commit(request.game_id, entry)
+            return _action_response(request, entry, before, request.hand_index)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/game/{game_id}/insurance")
 async def place_insurance(request: InsuranceRequest):
-    if request.game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[request.game_id]
-    player = game.players[request.player_index]
-    
-    try:
-        game.place_insurance(player, request.amount)
-        return get_game_state(request.game_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    async with _locked_entry(request.game_id) as entry:
+        game = entry.game
+        player = game.players[request.player_index]
+
+        before = game.version
+        try:
+            game.place_insurance(player, request.amount)
+            _commit(request.game_id, entry)
+            return _action_response(request, entry, before, len(player.hands))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/game/{game_id}/resolve")
 async def resolve_game(game_id: str):
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
+    entry = await _get_entry(game_id)
 
-    # Fast path: return cached response if already resolved
-    cached = _resolve_response_cache.get(game_id)
+    # Fast path: replay the stored body if already resolved
+    cached = entry.resolve_response
     if cached is not None:
-        return copy.deepcopy(cached)
-
-    # Ensure a lock exists for this game
-    lock = _resolve_locks.setdefault(game_id, threading.Lock())
-
-    # Acquire lock to perform resolve exactly once
-    acquired = lock.acquire(timeout=5.0)
-    if not acquired:
-        # If we couldn't acquire lock in reasonable time, try returning cached response
-        cached = _resolve_response_cache.get(game_id)
-        if cached is not None:
-            return copy.deepcopy(cached)
-        raise HTTPException(status_code=503, detail="Resolve in progress, try again")
+        return Response(content=cached, media_type="application/json")
 
-    try:
-        # Another thread may have resolved while we waited for lock — check again
-        cached = _resolve_response_cache.get(game_id)
+    # Waiting for the lock yields to the event loop; a concurrent resolve
+    # finishes first and this one replays its body
+    async with _locked_entry(game_id) as entry:
+        cached = entry.resolve_response
         if cached is not None:
-            return copy.deepcopy(cached)
+            return Response(content=cached, media_type="application/json")
 
-        game = games[game_id]
+        game = entry.game
 
         game.play_dealer()
         insurance_results = game.resolve_insurance()
@@ -252,16 +422,93 @@ async def resolve_game(game_id: str):
             }
             for player, player_results in zip(game.players, results)
         ]
+        response_dict["seed"] = game.seed
+
+        # Encode once; bytes are immutable, so every replay shares them
+        body = json.dumps(response_dict, separators=(",", ":")).encode()
+        entry.resolve_response = body
+        _commit(game_id, entry)
+        return Response(content=body, media_type="application/json")
+
+@app.get("/api/game/{game_id}/advice")
+async def get_advice(game_id: str, player_index: int, hand_index: int = 0):
+    # The lock keeps moves from changing the game while a worker reads it
+    async with _locked_entry(game_id) as entry:
+        game = entry.game
+        try:
+            player = game.players[player_index]
+            advice = await asyncio.get_running_loop().run_in_executor(
+                advice_executor, game.advise, player, hand_index
+            )
+        except (IndexError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "player_index": player_index,
+        "hand_index": hand_index,
+        "best": advice.best.value,
+        "ev": {action.value: ev for action, ev in advice.ev.items()},
+    }
 
-        # Cache a deep copy and return a deep copy
-        _resolve_response_cache[game_id] = copy.deepcopy(response_dict)
-        return copy.deepcopy(response_dict)
-    finally:
-        lock.release()
+def _etag(version: int) -> str:
+    return f'"{version}"'
 
 @app.get("/api/game/{game_id}")
-async def get_game(game_id: str):
-    return get_game_state(game_id)
+async def get_game(game_id: str, if_none_match: Optional[str] = Header(None)):
+    entry = await _get_entry(game_id)
+    version = entry.game.version
+    etag = _etag(version)
+    # The client's copy is current: skip rendering and the body entirely
+    if if_none_match is not None and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # Render once per version; polls between actions replay the same bytes
+    cached = entry.state_response
+    if cached is None or cached[0] != version:
+        cached = entry.state_response = (version, _render_state(game_id))
+    return Response(
+        content=cached[1],
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+@app.get("/api/game/{game_id}/events")
+async def game_events(game_id: str, request: Request, last_event_id: Optional[str] = Header(None)):
+    """Server-sent events: the game state, pushed after every change."""
+    entry = await _get_entry(game_id)
+    feed = entry.feed
+    subscription = feed.subscribe()
+    game = entry.game
+    # A reconnecting client that already has the current version gets no replay
+    if last_event_id != str(game.version):
+        subscription.push(sse_frame(game.version, _render_state(game_id, _all_finished(game))))
+
+    async def stream():
+        try:
+            while True:
+                frame = await subscription.next(KEEPALIVE_INTERVAL)
+                # Closed: the store dropped the game, a reconnect gets the live one
+                if subscription.closed or await request.is_disconnected():
+                    return
+                if frame is None:
+                    # Idle: end the stream once this entry is gone, else keep it
+                    # open. peek() neither keeps the game alive nor reloads it
+                    if store.peek(game_id) is not entry:
+                        return
+                    frame = KEEPALIVE
+                yield frame
+        finally:
+            feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/store/stats")
+async def store_stats():
+    return await asyncio.to_thread(store.stats)
 
 @app.get("/health")
 async def health():
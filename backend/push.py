@@ -0,0 +1,89 @@
+"""
+Server-sent events for game state. Every GameEntry has a StateFeed; a
+change to the game is rendered into one SSE frame that all subscribers of
+the table share. A subscriber only keeps the newest frame, so a slow
+client skips intermediate versions instead of queueing them.
+"""
+import asyncio
+from typing import Optional
+
+
+KEEPALIVE_INTERVAL = 15.0  # Seconds between comments that keep idle streams open
+KEEPALIVE = b": keepalive\n\n"
+
+
+def sse_frame(version: int, body: bytes, event: str = "state") -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (version, event.encode(), body)
+
+
+class Subscription:
+    __slots__ = ("_frame", "_ready", "closed")
+
+    def __init__(self):
+        self._frame: Optional[bytes] = None
+        self._ready = asyncio.Event()
+        self.closed = False
+
+    def push(self, frame: bytes):
+        # Newer state supersedes a frame the client hasn't read yet
+        self._frame = frame
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[bytes]:
+        """
+        The newest unread frame, or None if nothing changed in `timeout`
+        seconds or the subscription was closed.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        frame, self._frame = self._frame, None
+        return frame
+
+
+class StateFeed:
+    """Subscribers of one game. Used from the event loop, except close()."""
+
+    __slots__ = ("subscribers", "published", "_loop")
+
+    def __init__(self):
+        self.subscribers: set[Subscription] = set()
+        self.published = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription()
+        self.subscribers.add(subscription)
+        return subscription
+
+    def close(self):
+        """Ends every subscription. Safe to call from any thread."""
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._close)
+        except RuntimeError:
+            pass  # The loop is gone, and its streams with it
+
+    def _close(self):
+        for subscription in self.subscribers:
+            subscription.close()
+        self.subscribers.clear()
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    def publish(self, frame: bytes):
+        for subscription in self.subscribers:
+            subscription.push(frame)
+        self.published += 1
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
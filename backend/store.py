@@ -0,0 +1,419 @@
+"""
+Game storage for the API. Each game lives in a GameEntry together with its
+cached responses, lock and event subscribers, so they are all
+evicted at once.
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from backend.push import StateFeed
+from engine.game import BlackjackGame
+from engine.snapshot import decode_game, encode_game
+
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_IDLE_TTL = 3600.0  # Seconds without a request before a game is dropped
+DEFAULT_REAP_INTERVAL = 60.0
+DEFAULT_RETENTION = 86400.0  # Seconds an untouched game is kept on disk
+DEFAULT_FLUSH_INTERVAL = 0.05
+DEFAULT_FLUSH_BATCH = 256
+DEFAULT_RETRY_DELAY = 1.0  # Seconds the writer waits after a failed flush
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class GameEntry:
+    game: BlackjackGame
+    # Encoded JSON body of the first /resolve, replayed as is so resolving
+    # is idempotent and repeats cost no serialization
+    resolve_response: Optional[bytes] = None
+    # Serializes the API's changes to the game without blocking the event loop
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_access: float = 0.0
+    # (game version, encoded JSON body) of the last GET of the game state
+    state_response: Optional[tuple[int, bytes]] = None
+    # Open event streams of the game, dropped with it
+    feed: StateFeed = field(default_factory=StateFeed)
+    # Set once the store dropped the entry; a later get() returns a new one
+    closed: bool = False
+
+    def close(self):
+        self.closed = True
+        self.feed.close()
+
+
+class GameStore:
+    """Interface the API uses to keep games between requests."""
+
+    def __init__(self):
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_reaper = threading.Event()
+
+    def get(self, game_id: str) -> Optional[GameEntry]:
+        raise NotImplementedError
+
+    def peek(self, game_id: str) -> Optional[GameEntry]:
+        """The live entry for a game, if any, without touching or loading it."""
+        raise NotImplementedError
+
+    def cached(self, game_id: str) -> Optional[GameEntry]:
+        """Like get(), but only from memory: never waits on storage."""
+        return self.get(game_id)
+
+    def add(self, game_id: str, game: BlackjackGame) -> GameEntry:
+        raise NotImplementedError
+
+    def remove(self, game_id: str) -> bool:
+        raise NotImplementedError
+
+    def save(self, game_id: str, entry: GameEntry):
+        """
+        Called after every change to an entry's game or resolve response.
+        Raises ValueError if the game can't be stored.
+        """
+
+    def revert(self, game_id: str):
+        """Drops changes to a game since its last successful save()."""
+
+    def close(self):
+        pass
+
+    def reap(self) -> int:
+        """Drops idle games; returns how many were dropped."""
+        return 0
+
+    def stats(self) -> dict:
+        return {}
+
+    def start_reaper(self, interval: float = DEFAULT_REAP_INTERVAL):
+        """Reaps idle games from a daemon thread every `interval` seconds."""
+        if self._reaper is not None:
+            return
+        self._stop_reaper.clear()
+
+        def run():
+            while not self._stop_reaper.wait(interval):
+                self.reap()
+
+        self._reaper = threading.Thread(target=run, name="game-store-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self):
+        if self._reaper is None:
+            return
+        self._stop_reaper.set()
+        self._reaper.join()
+        self._reaper = None
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+
+class MemoryGameStore(GameStore):
+    """
+    In-process store bounded by an idle TTL and a maximum entry count.
+    Entries are kept in access order, so the least recently used game is
+    evicted first and idle games are found from the front. An entry whose
+    lock is held is in use and never evicted, so two requests can't end up
+    changing two copies of one game; dropped entries are closed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        idle_ttl: float | None = DEFAULT_IDLE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("Store needs room for at least one game")
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.clock = clock
+        self.evictions = Counter()  # Reason ("lru", "idle") -> games evicted
+        self._entries: OrderedDict[str, GameEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, game_id: str) -> Optional[GameEntry]:
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is None:
+                return None
+            now = self.clock()
+            if self._expired(entry, now) and not entry.lock.locked():
+                self._drop(game_id)
+                self.evictions["idle"] += 1
+                return None
+            entry.last_access = now
+            self._entries.move_to_end(game_id)
+            return entry
+
+    def peek(self, game_id: str) -> Optional[GameEntry]:
+        with self._lock:
+            return self._entries.get(game_id)
+
+    def add(self, game_id: str, game: BlackjackGame) -> GameEntry:
+        entry = GameEntry(game, last_access=self.clock())
+        with self._lock:
+            if game_id in self._entries:
+                self._drop(game_id)
+            self._entries[game_id] = entry
+            while len(self._entries) > self.max_entries:
+                victim = next(
+                    (key for key, e in self._entries.items() if key != game_id and not e.lock.locked()),
+                    None,
+                )
+                if victim is None:
+                    break  # Every game is busy; over the cap until one is free
+                self._drop(victim)
+                self.evictions["lru"] += 1
+        return entry
+
+    def remove(self, game_id: str) -> bool:
+        with self._lock:
+            if game_id not in self._entries:
+                return False
+            self._drop(game_id)
+            return True
+
+    def _drop(self, game_id: str):
+        self._entries.pop(game_id).close()
+
+    def _expired(self, entry: GameEntry, now: float) -> bool:
+        return self.idle_ttl is not None and now - entry.last_access > self.idle_ttl
+
+    def reap(self) -> int:
+        if self.idle_ttl is None:
+            return 0
+        with self._lock:
+            now = self.clock()
+            idle = []
+            # Access order means every idle game sits before the first live one
+            for game_id, entry in self._entries.items():
+                if not self._expired(entry, now):
+                    break
+                if not entry.lock.locked():
+                    idle.append(game_id)
+            for game_id in idle:
+                self._drop(game_id)
+            self.evictions["idle"] += len(idle)
+        return len(idle)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "games": len(self._entries),
+                "max_entries": self.max_entries,
+                "idle_ttl": self.idle_ttl,
+                "evicted_lru": self.evictions["lru"],
+                "evicted_idle": self.evictions["idle"],
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteGameStore(GameStore):
+    """
+    Durable store: a MemoryGameStore holds the hot games and a local SQLite
+    database (WAL mode) holds every game, so tables survive restarts.
+
+    save() snapshots the entry in the calling thread and queues it; a writer
+    thread flushes queued snapshots in one transaction per batch, keeping
+    only the latest snapshot of each game. With synchronous=NORMAL, WAL
+    commits don't fsync, so requests never wait on the disk. A crash can
+    lose the last flush interval of changes, but not corrupt the database.
+
+    Games evicted from memory, or written by an earlier process, are
+    rehydrated from the queue or the database on first access.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache: Optional[MemoryGameStore] = None,
+        retention: float | None = DEFAULT_RETENTION,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_batch: int = DEFAULT_FLUSH_BATCH,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        super().__init__()
+        self.cache = cache if cache is not None else MemoryGameStore()
+        self.retention = retention
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.retry_delay = retry_delay
+        self.flushed = 0
+        self.flush_failures = 0
+        self.rehydrated = 0
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "id TEXT PRIMARY KEY, state BLOB NOT NULL, resolve_response BLOB, updated_at REAL NOT NULL)"
+        )
+        self._db_lock = threading.Lock()
+        # Rehydration must not race another request creating a second entry
+        self._load_lock = threading.Lock()
+
+        self._pending: dict[str, tuple] = {}  # game_id -> row awaiting flush
+        self._pending_lock = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_behind, name="game-store-writer", daemon=True)
+        self._writer.start()
+
+    def _encode(self, game_id: str, entry: GameEntry) -> tuple:
+        return (game_id, encode_game(entry.game), entry.resolve_response, time.time())
+
+    def _decode(self, row: tuple) -> GameEntry:
+        _, state, response, _ = row
+        return GameEntry(decode_game(state), resolve_response=response)
+
+    def get(self, game_id: str) -> Optional[GameEntry]:
+        entry = self.cache.get(game_id)
+        if entry is not None:
+            return entry
+
+        with self._load_lock:
+            entry = self.cache.get(game_id)
+            if entry is not None:
+                return entry
+            with self._pending_lock:
+                row = self._pending.get(game_id)
+            if row is None:
+                with self._db_lock:
+                    row = self._db.execute(
+                        "SELECT id, state, resolve_response, updated_at FROM games WHERE id = ?",
+                        (game_id,),
+                    ).fetchone()
+            if row is None:
+                return None
+            stored = self._decode(row)
+            entry = self.cache.add(game_id, stored.game)
+            entry.resolve_response = stored.resolve_response
+            self.rehydrated += 1
+            return entry
+
+    def peek(self, game_id: str) -> Optional[GameEntry]:
+        # Only a cached entry has subscribers; a stored row isn't loaded
+        return self.cache.peek(game_id)
+
+    def cached(self, game_id: str) -> Optional[GameEntry]:
+        return self.cache.get(game_id)
+
+    def add(self, game_id: str, game: BlackjackGame) -> GameEntry:
+        entry = self.cache.add(game_id, game)
+        self.save(game_id, entry)
+        return entry
+
+    def save(self, game_id: str, entry: GameEntry):
+        row = self._encode(game_id, entry)
+        with self._pending_lock:
+            self._pending[game_id] = row
+            if len(self._pending) >= self.flush_batch:
+                self._pending_lock.notify()
+
+    def revert(self, game_id: str):
+        # The next get() rehydrates the last saved snapshot
+        self.cache.remove(game_id)
+
+    def remove(self, game_id: str) -> bool:
+        # Under the database lock, so an in-flight flush can't write it back
+        with self._db_lock:
+            with self._pending_lock:
+                pending = self._pending.pop(game_id, None) is not None
+            stored = self._db.execute("DELETE FROM games WHERE id = ?", (game_id,)).rowcount > 0
+        cached = self.cache.remove(game_id)
+        return cached or pending or stored
+
+    def _write_behind(self):
+        while True:
+            with self._pending_lock:
+                if not self._pending and not self._closed:
+                    self._pending_lock.wait(self.flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception:
+                # The rows are queued again; keep the writer alive and retry
+                self.flush_failures += 1
+                logger.exception("Flushing games failed")
+                if closed:
+                    return
+                with self._pending_lock:
+                    if not self._closed:
+                        self._pending_lock.wait(self.retry_delay)
+                continue
+            if closed:
+                return
+
+    def flush(self) -> int:
+        """Writes every queued snapshot in one transaction; returns how many."""
+        with self._db_lock:
+            with self._pending_lock:
+                rows, self._pending = list(self._pending.values()), {}
+            if not rows:
+                return 0
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?)", rows)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                with self._pending_lock:
+                    # A snapshot saved since then is newer and wins
+                    for row in rows:
+                        self._pending.setdefault(row[0], row)
+                raise
+            self._db.execute("COMMIT")
+            self.flushed += len(rows)
+        return len(rows)
+
+    def reap(self) -> int:
+        """Drops idle games from memory and expired games from disk."""
+        reaped = self.cache.reap()
+        if self.retention is not None:
+            with self._db_lock:
+                reaped += self._db.execute(
+                    "DELETE FROM games WHERE updated_at < ?", (time.time() - self.retention,)
+                ).rowcount
+        return reaped
+
+    def close(self):
+        """Flushes everything still queued and closes the database."""
+        with self._pending_lock:
+            self._closed = True
+            self._pending_lock.notify()
+        self._writer.join()
+        self._db.close()
+
+    def stats(self) -> dict:
+        with self._pending_lock:
+            pending = len(self._pending)
+        with self._db_lock:
+            (stored,) = self._db.execute("SELECT COUNT(*) FROM games").fetchone()
+        return {
+            **self.cache.stats(),
+            "stored": stored,
+            "pending_writes": pending,
+            "flushed": self.flushed,
+            "flush_failures": self.flush_failures,
+            "rehydrated": self.rehydrated,
+        }
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._db_lock:
+            (stored,) = self._db.execute("SELECT COUNT(*) FROM games").fetchone()
+        return stored
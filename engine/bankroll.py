@@ -0,0 +1,152 @@
+"""
+Bankroll paths and risk of ruin, vectorized with NumPy.
+
+Rounds are treated as independent draws from an outcome distribution of
+net results, built from engine results (SimulationResult.round_histogram
+or HandOutcome lists) or from exact probabilities. Many bankroll paths
+are evolved together, a block of rounds at a time, so memory stays at
+paths x block no matter how many rounds are played.
+
+NumPy is only needed by this module and engine.batch.
+"""
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from engine.payouts import HandOutcome
+
+
+BLOCK_ROUNDS = 1024
+NOT_RUINED = -1
+
+
+@dataclass(frozen=True, slots=True)
+class OutcomeDistribution:
+    values: np.ndarray  # Net result of a round (or hand), distinct values
+    probabilities: np.ndarray
+
+    @classmethod
+    def from_probabilities(cls, probabilities: Mapping[int, float]) -> "OutcomeDistribution":
+        """Exact distribution: {net result: probability}."""
+        values = np.array(sorted(probabilities), dtype=np.int64)
+        weights = np.array([probabilities[v] for v in values.tolist()], dtype=float)
+        if len(values) == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Need at least one outcome with positive probability")
+        return cls(values, weights / weights.sum())
+
+    @classmethod
+    def from_histogram(cls, histogram: Mapping[int, int]) -> "OutcomeDistribution":
+        """Empirical distribution, e.g. SimulationResult.round_histogram."""
+        return cls.from_probabilities(histogram)
+
+    @classmethod
+    def from_outcomes(cls, outcomes: Iterable[HandOutcome]) -> "OutcomeDistribution":
+        """Per-hand distribution from resolved HandOutcomes."""
+        return cls.from_histogram(Counter(outcome.payout for outcome in outcomes))
+
+    @property
+    def mean(self) -> float:
+        return float(self.values @ self.probabilities)
+
+    @property
+    def variance(self) -> float:
+        return float(((self.values - self.mean) ** 2) @ self.probabilities)
+
+
+@dataclass(slots=True)
+class BankrollResult:
+    final: np.ndarray  # Bankroll at the end of each path (or at ruin)
+    ruin_round: np.ndarray  # 1-based round of ruin, NOT_RUINED if it survived
+    max_drawdown: np.ndarray  # Largest fall from a running peak, per path
+    rounds: int
+
+    @property
+    def paths(self) -> int:
+        return len(self.final)
+
+    @property
+    def ruined(self) -> np.ndarray:
+        return self.ruin_round != NOT_RUINED
+
+    @property
+    def risk_of_ruin(self) -> float:
+        return float(self.ruined.mean())
+
+    def drawdown_quantiles(self, quantiles=(0.5, 0.9, 0.99)) -> dict:
+        return dict(zip(quantiles, np.quantile(self.max_drawdown, quantiles).tolist()))
+
+    def time_to_ruin_quantiles(self, quantiles=(0.1, 0.5, 0.9)) -> dict:
+        """Quantiles of the ruin round over the ruined paths only."""
+        ruin_rounds = self.ruin_round[self.ruined]
+        if not ruin_rounds.size:
+            return {q: math.nan for q in quantiles}
+        return dict(zip(quantiles, np.quantile(ruin_rounds, quantiles).tolist()))
+
+
+def simulate_bankroll(
+    distribution: OutcomeDistribution,
+    bankroll: int,
+    rounds: int,
+    paths: int = 10_000,
+    ruin_level: int = 0,
+    rng: np.random.Generator | None = None,
+    block_rounds: int = BLOCK_ROUNDS,
+) -> BankrollResult:
+    """
+    Plays `paths` bankrolls for up to `rounds` rounds each. A path is ruined
+    (and stops) once its bankroll is at or below `ruin_level`.
+    """
+    if bankroll <= ruin_level:
+        raise ValueError("Bankroll must start above the ruin level")
+    if rounds < 1 or paths < 1:
+        raise ValueError("Need at least one round and one path")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    current = np.full(paths, bankroll, dtype=np.int64)
+    peak = current.copy()
+    max_drawdown = np.zeros(paths, dtype=np.int64)
+    ruin_round = np.full(paths, NOT_RUINED, dtype=np.int64)
+    alive = np.arange(paths)
+
+    played = 0
+    while played < rounds and alive.size:
+        block = min(block_rounds, rounds - played)
+        steps = rng.choice(distribution.values, size=(alive.size, block), p=distribution.probabilities)
+        path = current[alive, None] + np.cumsum(steps, axis=1)
+
+        below = path <= ruin_level
+        hit = below.any(axis=1)
+        if hit.any():
+            first = below.argmax(axis=1)
+            # Freeze ruined paths at their ruin value for the rest of the block
+            after = np.arange(block) > first[:, None]
+            after &= hit[:, None]
+            path = np.where(after, path[np.arange(alive.size), first][:, None], path)
+            ruin_round[alive[hit]] = played + first[hit] + 1
+
+        running_peak = np.maximum(peak[alive, None], np.maximum.accumulate(path, axis=1))
+        max_drawdown[alive] = np.maximum(max_drawdown[alive], (running_peak - path).max(axis=1))
+        peak[alive] = running_peak[:, -1]
+        current[alive] = path[:, -1]
+
+        alive = alive[~hit]
+        played += block
+
+    return BankrollResult(current, ruin_round, max_drawdown, rounds)
+
+
+def approximate_risk_of_ruin(distribution: OutcomeDistribution, bankroll: float) -> float:
+    """
+    Risk of ever being ruined with unlimited rounds, from the diffusion
+    approximation exp(-2 * mean * bankroll / variance). 1 for a losing game.
+    """
+    mean, variance = distribution.mean, distribution.variance
+    if mean <= 0:
+        return 1.0
+    if variance == 0:
+        return 0.0
+    return math.exp(-2 * mean * bankroll / variance)
@@ -0,0 +1,139 @@
+"""
+NumPy batch versions of dealer play and hand settlement for large Monte
+Carlo runs. They follow the same rules as TurnManager.dealer_play and
+PayoutResolver.resolve_hand but work on arrays of card values (aces as 11).
+
+NumPy is only needed by this module; the rest of the engine is stdlib only.
+"""
+import numpy as np
+
+from engine.enums import GameResult
+from engine.rules import DEFAULT_RULES
+
+
+# Result codes returned by settle_batch, indexing into RESULTS
+WIN, LOSE, PUSH, BLACKJACK_WIN = range(4)
+RESULTS = (GameResult.WIN, GameResult.LOSE, GameResult.PUSH, GameResult.BLACKJACK_WIN)
+
+CARD_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 11])
+# Draw probabilities of CARD_VALUES for an infinite shoe
+INFINITE_SHOE_WEIGHTS = np.array([1, 1, 1, 1, 1, 1, 1, 1, 4, 1]) / 13
+
+
+def _hard(values):
+    return np.where(values == 11, 1, values)
+
+
+def _hand_value(hard, aces):
+    # At most one ace can count as 11, and only while it doesn't bust
+    return np.where((aces > 0) & (hard <= 11), hard + 10, hard)
+
+
+def _dealer_draws(totals, hard, aces, hits_soft_17):
+    if hits_soft_17:
+        return (totals < 17) | ((totals == 17) & (aces > 0) & (hard == 7))
+    return totals < 17
+
+
+def dealer_play_batch(
+    up, hole, rng=None, draws=None, weights=INFINITE_SHOE_WEIGHTS, hits_soft_17=False
+):
+    """
+    Plays out every dealer hand at once: hit while below 17, then stand on
+    all 17s or, with hits_soft_17, hit soft 17 too.
+
+    up, hole: dealer upcard and hole card values, one per hand.
+    draws: optional (hands, max_hits) array of the cards each dealer takes
+    in order; otherwise cards are drawn from `rng` with `weights`.
+    Returns (totals, blackjack) arrays.
+    """
+    up = np.asarray(up, dtype=np.int64)
+    hole = np.asarray(hole, dtype=np.int64)
+    if draws is not None:
+        draws = np.asarray(draws)
+    elif rng is None:
+        rng = np.random.default_rng()
+
+    hard = _hard(up) + _hard(hole)
+    aces = (up == 11).astype(np.int64) + (hole == 11)
+    totals = _hand_value(hard, aces)
+    # A two-card 21 never draws, so naturals are known before any hits
+    blackjack = totals == 21
+    active = np.flatnonzero(_dealer_draws(totals, hard, aces, hits_soft_17))
+
+    hit = 0
+    while active.size:
+        if draws is not None:
+            cards = draws[active, hit]
+        else:
+            cards = rng.choice(CARD_VALUES, size=active.size, p=weights)
+        hard[active] += _hard(cards)
+        aces[active] += cards == 11
+        totals[active] = _hand_value(hard[active], aces[active])
+        active = active[_dealer_draws(totals[active], hard[active], aces[active], hits_soft_17)]
+        hit += 1
+
+    return totals, blackjack
+
+
+def settle_batch(
+    player_totals, player_blackjack, bets, dealer_totals, dealer_blackjack, blackjack_payout=(3, 2)
+):
+    """
+    Settles hands with PayoutResolver.resolve_hand's precedence: player bust,
+    dealer bust, naturals (blackjack pays blackjack_payout), then totals.
+    Returns (result codes, net payouts); see RESULTS for the codes.
+    """
+    player_totals = np.asarray(player_totals)
+    dealer_totals = np.asarray(dealer_totals)
+    player_blackjack = np.asarray(player_blackjack, dtype=bool)
+    dealer_blackjack = np.asarray(dealer_blackjack, dtype=bool)
+    bets = np.broadcast_to(np.asarray(bets, dtype=np.int64), player_totals.shape)
+    numerator, denominator = blackjack_payout
+
+    conditions = [
+        player_totals > 21,
+        dealer_totals > 21,
+        player_blackjack & dealer_blackjack,
+        player_blackjack,
+        dealer_blackjack,
+        player_totals > dealer_totals,
+        player_totals < dealer_totals,
+    ]
+    codes = np.select(
+        conditions,
+        [LOSE, WIN, PUSH, BLACKJACK_WIN, LOSE, WIN, LOSE],
+        default=PUSH,
+    )
+    payouts = np.select(
+        conditions,
+        [-bets, bets, 0, (bets * numerator) // denominator, -bets, bets, -bets],
+        default=0,
+    )
+    return codes, payouts
+
+
+def resolve_batch(
+    player_totals,
+    player_blackjack,
+    bets,
+    dealer_up,
+    dealer_hole,
+    rng=None,
+    draws=None,
+    weights=INFINITE_SHOE_WEIGHTS,
+    rules=DEFAULT_RULES,
+):
+    """Plays all dealer hands and settles the player hands against them."""
+    dealer_totals, dealer_blackjack = dealer_play_batch(
+        dealer_up, dealer_hole, rng=rng, draws=draws, weights=weights,
+        hits_soft_17=rules.dealer_hits_soft_17,
+    )
+    return settle_batch(
+        player_totals, player_blackjack, bets, dealer_totals, dealer_blackjack,
+        blackjack_payout=rules.blackjack_payout,
+    )
+
+
+def to_game_results(codes) -> list[GameResult]:
+    return [RESULTS[code] for code in np.asarray(codes).tolist()]
@@ -0,0 +1,34 @@
+from engine.models import Card
+
+
+SUITS = ("Hearts", "Diamonds", "Clubs", "Spades")
+RANKS = (
+    ("Ace", 11), ("2", 2), ("3", 3), ("4", 4), ("5", 5),
+    ("6", 6), ("7", 7), ("8", 8), ("9", 9),
+    ("10", 10), ("Jack", 10), ("Queen", 10), ("King", 10),
+)
+
+
+def _build_cards() -> tuple[Card, ...]:
+    return tuple(
+        Card(
+            f"{rank} of {suit}",
+            value,
+            rank=rank,
+            suit=suit,
+            id=suit_index * len(RANKS) + rank_index,
+        )
+        for suit_index, suit in enumerate(SUITS)
+        for rank_index, (rank, value) in enumerate(RANKS)
+    )
+
+
+# The 52 canonical cards, indexed by Card.id. Decks, hands and serializers
+# share these objects by reference instead of building new ones.
+CARDS = _build_cards()
+
+_BY_NAME = {card.name: card for card in CARDS}
+
+
+def card_for(rank: str, suit: str) -> Card:
+    return _BY_NAME[f"{rank} of {suit}"]
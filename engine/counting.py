@@ -0,0 +1,17 @@
+"""
+Card counting tag systems. A tag system is a tuple of 10 tags in
+composition order: aces first, then 2 to 9, then ten-valued cards.
+"""
+
+HI_LO = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1)
+# Knock-out: unbalanced, 7s count +1
+KO = (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1)
+HI_OPT_I = (0, 0, 1, 1, 1, 1, 0, 0, 0, -1)
+OMEGA_II = (0, 1, 1, 2, 2, 2, 1, 0, -1, -2)
+
+
+def true_count(running_count: int, cards_remaining: int) -> float:
+    """Running count per deck (52 cards) remaining."""
+    if cards_remaining <= 0:
+        return 0.0
+    return running_count * 52 / cards_remaining
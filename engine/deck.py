@@ -1,24 +1,205 @@
 import random
+from collections import Counter
+from engine.cards import CARDS
+from engine.counting import HI_LO, true_count
 from engine.models import Card
+from engine.probability import composition_of, shoe_composition
+from engine.rng import make_rng
 
 
 class Deck:
-    def __init__(self):
-        self.cards = self._create()
-        random.shuffle(self.cards)
+    """
+    With lazy=True the cards are not shuffled up front; each draw() performs
+    the next Fisher-Yates step instead. For a given seed this deals exactly
+    the same sequence as a full shuffle, but only pays for the cards dealt.
+    The order of `cards` is then not the dealing order.
+
+    The deck also keeps the remaining composition and a running count under
+    `tags` (Hi-Lo by default), both updated in O(1) per draw. The count only
+    holds cards the table has seen: a card dealt face down with
+    draw_hidden() (the dealer's hole card) is counted once reveal()ed, at
+    the latest when the next round starts.
+    """
+
+    __slots__ = ("cards", "seed", "rng", "lazy", "tags", "running_count", "_counts", "_hidden")
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        rng: random.Random | None = None,
+        lazy: bool = False,
+        tags: tuple[int, ...] = HI_LO,
+    ):
+        self.seed, self.rng = make_rng(seed, rng)
+        self.lazy = lazy
+        self.tags = tags
+        self.shuffle()
+
+    def _create(self):
+        return list(CARDS)
+
+    def _full_composition(self) -> tuple[int, ...]:
+        return shoe_composition(1)
+
+    def _fill(self, cards: list[Card]):
+        self.cards = cards
+        if not self.lazy:
+            self.rng.shuffle(cards)
+        self._counts = list(self._full_composition())
+        self.running_count = 0
+
+    def shuffle(self):
+        self._hidden = []
+        self._fill(self._create())
+
+    def start_round(self):
+        # A single deck is dealt fresh every round
+        self.shuffle()
+
+    def recount(self):
+        """Rebuilds the composition and count after `cards` was replaced directly."""
+        full = self._full_composition()
+        self._counts = list(composition_of(self.cards))
+        self.running_count = sum(
+            (total - left) * tag for total, left, tag in zip(full, self._counts, self.tags)
+        ) - sum(self._tag(card) for card in self._hidden)
+
+    def materialize(self):
+        """
+        Runs the remaining lazy shuffle steps now, so `cards` is in dealing
+        order (next card last) and the deck deals exactly what it would have.
+        """
+        if not self.lazy:
+            return
+        cards = self.cards
+        randrange = self.rng.randrange
+        for i in range(len(cards) - 1, 0, -1):
+            j = randrange(i + 1)
+            cards[i], cards[j] = cards[j], cards[i]
+        self.lazy = False
+
+    @property
+    def composition(self) -> tuple[int, ...]:
+        """Remaining cards per value, in engine.probability composition order."""
+        return tuple(self._counts)
+
+    @property
+    def true_count(self) -> float:
+        # Face-down cards are still unseen, like the ones left in the deck
+        return true_count(self.running_count, len(self.cards) + len(self._hidden))
+
+    @property
+    def hidden(self) -> tuple[Card, ...]:
+        """Cards dealt face down and not revealed yet."""
+        return tuple(self._hidden)
+
+    def _tag(self, card: Card) -> int:
+        return self.tags[0 if card.value == 11 else card.value - 1]
+
+    def draw(self) -> Card:
+        cards = self.cards
+        if self.lazy and len(cards) > 1:
+            # Same step random.shuffle takes for the last position
+            j = self.rng.randrange(len(cards))
+            cards[j], cards[-1] = cards[-1], cards[j]
+        card = cards.pop()
+
+        # Same slot as probability.composition_index, inlined for speed
+        index = 0 if card.value == 11 else card.value - 1
+        self._counts[index] -= 1
+        self.running_count += self.tags[index]
+        return card
+
+    def draw_hidden(self) -> Card:
+        """Deals a card face down: it leaves the composition but isn't counted yet."""
+        card = self.draw()
+        self.running_count -= self._tag(card)
+        self._hidden.append(card)
+        return card
+
+    def reveal(self, card: Card):
+        """Counts a card dealt with draw_hidden(); other cards are ignored."""
+        if card in self._hidden:
+            self._hidden.remove(card)
+            self.running_count += self._tag(card)
+
+    def reveal_all(self):
+        for card in list(self._hidden):
+            self.reveal(card)
+
+
+class Shoe(Deck):
+    """Multi-deck shoe meant to be shared by consecutive rounds at a table.
+
+    The cards are built once; the shoe is only reshuffled at the start of a
+    round after the cut card has come out. A round that runs the shoe dry
+    continues from the reshuffled discards, never from cards still in play.
+    """
+
+    __slots__ = ("num_decks", "penetration", "cut_card", "cut_card_reached", "_all_cards", "_round_cards")
+
+    def __init__(
+        self,
+        num_decks: int = 6,
+        penetration: float = 0.75,
+        seed: int | None = None,
+        rng: random.Random | None = None,
+        lazy: bool = False,
+        tags: tuple[int, ...] = HI_LO,
+    ):
+        if num_decks < 1:
+            raise ValueError("Shoe needs at least one deck")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be between 0 and 1")
+
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self._all_cards = self._create()
+        # Number of cards left in the shoe when the cut card comes out
+        self.cut_card = len(self._all_cards) - int(len(self._all_cards) * penetration)
+        # Cards dealt since the round started, i.e. still in play
+        self._round_cards = []
+        super().__init__(seed=seed, rng=rng, lazy=lazy, tags=tags)
 
     def _create(self):
-        suits = ["Hearts", "Diamonds", "Clubs", "Spades"]
-        ranks = [
-            ("Ace", 11), ("2", 2), ("3", 3), ("4", 4), ("5", 5),
-            ("6", 6), ("7", 7), ("8", 8), ("9", 9),
-            ("10", 10), ("Jack", 10), ("Queen", 10), ("King", 10),
-        ]
-        return [
-            Card(f"{rank} of {suit}", value)
-            for suit in suits
-            for rank, value in ranks
-        ]
+        return super()._create() * self.num_decks
+
+    def _full_composition(self) -> tuple[int, ...]:
+        return shoe_composition(self.num_decks)
+
+    def shuffle(self):
+        self._hidden = []
+        self._fill(list(self._all_cards))
+        self.cut_card_reached = False
+
+    def start_round(self):
+        # Last round's hole card was turned over when the round ended
+        self.reveal_all()
+        self._round_cards = []
+        if self.cut_card_reached:
+            self.shuffle()
+
+    def _shuffle_discards(self):
+        in_play = Counter(card.id for card in self._round_cards)
+        discards = []
+        for card in self._all_cards:
+            if in_play[card.id]:
+                in_play[card.id] -= 1
+            else:
+                discards.append(card)
+        if not discards:
+            raise ValueError("Every card of the shoe is in play")
+        self._fill(discards)
+        # The cards in play stay counted; the next round starts a fresh shoe
+        self.recount()
+        self.cut_card_reached = True
 
     def draw(self) -> Card:
-        return self.cards.pop()
+        if not self.cards:
+            self._shuffle_discards()
+
+        card = super().draw()
+        self._round_cards.append(card)
+        if len(self.cards) <= self.cut_card:
+            self.cut_card_reached = True
+        return card
@@ -7,6 +7,15 @@ class TurnResult(Enum):
     BLACKJACK = "blackjack"
     STAND = "stand"
     DOUBLE = "double"
+    SURRENDER = "surrender"
+
+
+class Action(Enum):
+    HIT = "hit"
+    STAND = "stand"
+    DOUBLE = "double"
+    SPLIT = "split"
+    SURRENDER = "surrender"
 
 
 class GameResult(Enum):
@@ -14,3 +23,4 @@ class GameResult(Enum):
     LOSE = "lose"
     PUSH = "push"
     BLACKJACK_WIN = "blackjack_win"
+    SURRENDER = "surrender"
@@ -1,25 +1,73 @@
-from engine.deck import Deck
-from engine.models import Player, BetHand, Hand, Card
+import random
+from functools import lru_cache
+
+from engine.advisor import Advice, Advisor
+from engine.deck import Deck, Shoe
+from engine.cards import card_for
+from engine.models import Player, BetHand, Hand
 from engine.insurance import InsuranceManager
 from engine.split import SplitManager
 from engine.turns import TurnManager
 from engine.payouts import PayoutResolver
+from engine.rules import DEFAULT_RULES, RuleSet
+
+
+# Rules come from clients, so only the most recently used rule sets are kept
+MANAGER_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=MANAGER_CACHE_SIZE)
+def _managers(rules: RuleSet):
+    """
+    Managers hold no per-game state, so each RuleSet compiles its
+    rule-specialized managers once and every game on those rules shares them.
+    """
+    return InsuranceManager(rules), SplitManager(), TurnManager(rules), PayoutResolver(rules), Advisor()
 
 
 class BlackjackGame:
-    def __init__(self, players: list[tuple[str, int]]):
+    __slots__ = (
+        "deck", "players", "dealer_hand", "current_player_index",
+        "insurance", "split", "turns", "payouts", "advisor", "rules", "version",
+    )
+
+    def __init__(
+        self,
+        players: list[tuple[str, int]],
+        shoe: Shoe | None = None,
+        seed: int | None = None,
+        rng: random.Random | None = None,
+        rules: RuleSet | None = None,
+    ):
         """
         players: [(name, starting_bet)]
+        shoe: optional table shoe shared with earlier and later rounds
+        seed / rng: seed or generator for the game's own deck, for replays
+        rules: table rules; the game's own deck uses their deck count
         """
-        self.deck = Deck()
+        self.rules = rules = DEFAULT_RULES if rules is None else rules
+        if shoe is not None:
+            if seed is not None or rng is not None:
+                raise ValueError("A shared shoe carries its own seed")
+            shoe.start_round()
+            self.deck = shoe
+        elif rules.num_decks == 1:
+            self.deck = Deck(seed=seed, rng=rng, lazy=True)
+        else:
+            self.deck = Shoe(
+                num_decks=rules.num_decks,
+                penetration=rules.penetration,
+                seed=seed,
+                rng=rng,
+                lazy=True,
+            )
         self.players = []
         self.dealer_hand = Hand()
         self.current_player_index = 0
+        # Bumped by every change to the game, so callers can cache by it
+        self.version = 0
 
-        self.insurance = InsuranceManager()
-        self.split = SplitManager()
-        self.turns = TurnManager()
-        self.payouts = PayoutResolver()
+        self.insurance, self.split, self.turns, self.payouts, self.advisor = _managers(rules)
 
         for name, bet in players:
             p = Player(name)
@@ -32,19 +80,42 @@ class BlackjackGame:
         self._auto_finish_natural_blackjacks()
         self._advance_turn_if_needed()
 
+    def new_round(self, bets: list[int]):
+        """
+        Deals the next round at the same table, reusing the players, managers
+        and deck. bets: one starting bet per player, in seat order.
+        """
+        if len(bets) != len(self.players):
+            raise ValueError("Expected one bet per player")
+
+        self.deck.start_round()
+        self.dealer_hand = Hand()
+        self.current_player_index = 0
+        for p, bet in zip(self.players, bets):
+            p.hands = [BetHand(bet=bet)]
+            p.insurance_bet = 0
+
+        self._initial_deal()
+        self._auto_finish_natural_blackjacks()
+        self._advance_turn_if_needed()
+        self.version += 1
+
     def _initial_deal(self):
-        for _ in range(2):
-            for p in self.players:
-                p.hands[0].hand.add(self.deck.draw())
-            self.dealer_hand.add(self.deck.draw())
+        for p in self.players:
+            p.hands[0].hand.add(self.deck.draw())
+        self.dealer_hand.add(self.deck.draw())
+        for p in self.players:
+            p.hands[0].hand.add(self.deck.draw())
+        # The hole card stays out of the count until the dealer turns it over
+        self.dealer_hand.add(self.deck.draw_hidden())
 
     # to showcase insurance without waiting for black  jack
     def _test_initial_deal(self):
         for _ in range(2):
             for p in self.players:
                 p.hands[0].hand.add(self.deck.draw())
-        self.dealer_hand.add(Card("Ace of Spades", 11))
-        self.dealer_hand.add(Card("10 of Spades", 10))
+        self.dealer_hand.add(card_for("Ace", "Spades"))
+        self.dealer_hand.add(card_for("10", "Spades"))
 
     def _advance_turn_if_needed(self):
         if self.current_player_index is None:
@@ -65,6 +136,22 @@ class BlackjackGame:
                 if bet_hand.hand.is_blackjack:
                     bet_hand.is_finished = True
 
+    _STATE = ("deck", "players", "dealer_hand", "current_player_index", "rules", "version")
+
+    def __getstate__(self):
+        # Managers are rebuilt from the rules, so pickles stay small and
+        # restored games share the compiled managers again
+        return {name: getattr(self, name) for name in self._STATE}
+
+    def __setstate__(self, state):
+        for name in self._STATE:
+            setattr(self, name, state[name])
+        self.insurance, self.split, self.turns, self.payouts, self.advisor = _managers(self.rules)
+
+    @property
+    def seed(self) -> int | None:
+        return self.deck.seed
+
     @property
     def dealer_has_blackjack(self) -> bool:
         return self.dealer_hand.is_blackjack
@@ -78,25 +165,37 @@ class BlackjackGame:
 
         player.hands.pop(hand_index)
         player.hands.extend([h1, h2])
+        self.version += 1
 
     def hit(self, player: Player, hand_index: int):
         result = self.turns.hit(player.hands[hand_index], self.deck)
         self._advance_turn_if_needed()
+        self.version += 1
         return result
 
     def stand(self, player: Player, hand_index: int):
         result = self.turns.stand(player.hands[hand_index])
         self._advance_turn_if_needed()
+        self.version += 1
         return result
 
     def double(self, player: Player, hand_index: int):
         result = self.turns.double(player.hands[hand_index], self.deck)
         self._advance_turn_if_needed()
+        self.version += 1
+        return result
+
+    def surrender(self, player: Player, hand_index: int):
+        result = self.turns.surrender(player.hands[hand_index])
+        self._advance_turn_if_needed()
+        self.version += 1
         return result
 
     def play_dealer(self):
-        # Delegate to TurnManager to perform dealer auto-play (hit until 17)
+        self.deck.reveal(self.dealer_hand.cards[1])
+        # Delegate to TurnManager to perform dealer auto-play (hit until 17, soft 17 per rules)
         self.turns.dealer_play(self.dealer_hand, self.deck)
+        self.version += 1
 
     def resolve_insurance(self) -> dict:
         results = {}
@@ -104,18 +203,21 @@ class BlackjackGame:
             payout = self.insurance.resolve(p, self.dealer_has_blackjack)
             p.balance += payout
             results[p.name] = payout
+        self.version += 1
         return results
 
     def resolve_bets(self):
-        results = []
-        for p in self.players:
-            player_results = []
-            for hand in p.hands:
-                outcome = self.payouts.resolve_hand(hand, self.dealer_hand)
+        results = self.payouts.settle_table(self.players, self.dealer_hand)
+        for p, player_results in zip(self.players, results):
+            for outcome in player_results:
                 p.balance += outcome.payout
-                player_results.append(outcome)
-            results.append(player_results)
+        self.version += 1
         return results
 
+    def advise(self, player: Player, hand_index: int) -> Advice:
+        return self.advisor.advise(self, player.hands[hand_index])
+
     def place_insurance(self, player: Player, amount: int):
-        return self.insurance.place(player, amount)
+        result = self.insurance.place(player, amount)
+        self.version += 1
+        return result
@@ -0,0 +1,139 @@
+"""
+House edge of a RuleSet, computed rather than simulated.
+
+Every starting deal (two player cards and the dealer upcard, drawn from a
+full shoe) is weighted by its exact probability and played with the best
+action from advisor.action_evs, which scores hands with exact dealer
+tables. Legal actions come from the rule-compiled TurnManager and
+SplitManager, so doubling restrictions and surrender match real games.
+Insurance is never taken. The advisor's approximations apply (dealer
+table fixed at the decision point, no resplits).
+
+Results are cached on disk by RuleSet.fingerprint, so a ruleset is only
+computed once per machine.
+"""
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from engine.advisor import action_evs
+from engine.cards import CARDS
+from engine.models import BetHand, Hand
+from engine.probability import composition_index, index_value, remove_card, shoe_composition
+from engine.rules import DEFAULT_RULES, RuleSet
+from engine.split import SplitManager
+from engine.turns import TurnManager
+
+
+# Bump when the calculation changes so stale cached results are ignored
+CALCULATION_VERSION = 2
+DEFAULT_CACHE_PATH = (
+    Path(os.environ.get("BLACKJACK_CACHE_DIR", Path.home() / ".cache" / "blackjack"))
+    / "house_edge.json"
+)
+
+# One card per composition index to build hands from
+_CARD_FOR_INDEX = {composition_index(card.value): card for card in reversed(CARDS)}
+
+_memory_cache: dict[str, float] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class HouseEdge:
+    rules: RuleSet
+    ev: float  # Player EV per unit of starting bet
+
+    @property
+    def house_edge(self) -> float:
+        return -self.ev
+
+
+def compute_ev(rules: RuleSet = DEFAULT_RULES) -> float:
+    """Player EV per unit bet of one hand played optimally off the top of the shoe."""
+    turns = TurnManager(rules)
+    split = SplitManager()
+    full = shoe_composition(rules.num_decks)
+    total = sum(full)
+
+    ev = 0.0
+    for first in range(10):
+        after_first = remove_card(full, index_value(first))
+        # Deals (a, b) and (b, a) play the same, so count one of them twice
+        for second in range(first, 10):
+            p_hand = full[first] / total * after_first[second] / (total - 1)
+            if first != second:
+                p_hand *= 2
+            if p_hand == 0:
+                continue
+            after_hand = remove_card(after_first, index_value(second))
+
+            for up in range(10):
+                if not after_hand[up]:
+                    continue
+                p_up = after_hand[up] / (total - 2)
+                unseen = remove_card(after_hand, index_value(up))
+                bet_hand = BetHand(
+                    hand=Hand(cards=[_CARD_FOR_INDEX[first], _CARD_FOR_INDEX[second]]),
+                    bet=1,
+                )
+                evs = action_evs(
+                    bet_hand,
+                    index_value(up),
+                    unseen,
+                    can_double=turns.can_double(bet_hand),
+                    can_split=split.can_split(bet_hand),
+                    rules=rules,
+                    can_surrender=turns.can_surrender(bet_hand),
+                )
+                ev += p_hand * p_up * max(evs.values())
+    return ev
+
+
+def _cache_key(rules: RuleSet) -> str:
+    return f"v{CALCULATION_VERSION}:{rules.fingerprint}"
+
+
+def _load(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _store(path: Path, key: str, ev: float):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entries = _load(path)
+    entries[key] = ev
+    # Write then rename so readers never see a half-written file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def house_edge(rules: RuleSet = DEFAULT_RULES, cache_path: Path | None = DEFAULT_CACHE_PATH) -> HouseEdge:
+    """
+    House edge for `rules`, from the in-process cache, the on-disk cache at
+    `cache_path` (None disables it) or a fresh computation, in that order.
+    """
+    key = _cache_key(rules)
+    ev = _memory_cache.get(key)
+    if ev is None and cache_path is not None:
+        ev = _load(Path(cache_path)).get(key)
+    if ev is None:
+        ev = compute_ev(rules)
+        if cache_path is not None:
+            _store(Path(cache_path), key, ev)
+    _memory_cache[key] = ev
+    return HouseEdge(rules, ev)
+
+
+def clear_memory_cache():
+    _memory_cache.clear()
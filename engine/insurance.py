@@ -1,7 +1,13 @@
 from engine.models import Player
+from engine.rules import DEFAULT_RULES, RuleSet
 
 
 class InsuranceManager:
+    __slots__ = ("payout_ratio",)
+
+    def __init__(self, rules: RuleSet = DEFAULT_RULES):
+        self.payout_ratio = rules.insurance_payout
+
     def is_available(self, dealer_hand) -> bool:
         return dealer_hand.cards[0].value == 11
 
@@ -13,5 +19,5 @@ class InsuranceManager:
     def resolve(self, player: Player, dealer_has_blackjack: bool) -> int:
         if player.insurance_bet == 0:
             return 0
-        return   player.insurance_bet * 2 if dealer_has_blackjack else -player.insurance_bet
+        return   player.insurance_bet * self.payout_ratio if dealer_has_blackjack else -player.insurance_bet
 
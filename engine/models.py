@@ -1,51 +1,96 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Card:
     name: str
     value: int
+    # Derived from name and value, so equality and hashing ignore them
+    rank: str = field(default="", compare=False)
+    suit: str = field(default="", compare=False)
+    id: int = field(default=-1, compare=False)  # Index into engine.cards.CARDS, -1 for ad-hoc cards
 
 
-@dataclass
+@dataclass(slots=True)
 class Hand:
     cards: List[Card] = field(default_factory=list)
+    # Running totals updated by add(). Aces are counted as 1 in the hard
+    # total; at most one of them can ever count as 11.
+    _hard_total: int = field(default=0, init=False, repr=False, compare=False)
+    _aces: int = field(default=0, init=False, repr=False, compare=False)
+    _pair: bool = field(default=False, init=False, repr=False, compare=False)
+    _counted: int = field(default=0, init=False, repr=False, compare=False)
+    _tracked: Optional[list] = field(default=None, init=False, repr=False, compare=False)
 
     def add(self, card: Card):
+        self._sync()
         self.cards.append(card)
+        self._count(card)
+
+    def _count(self, card: Card):
+        if card.value == 11:
+            self._hard_total += 1
+            self._aces += 1
+        else:
+            self._hard_total += card.value
+        self._pair = self._counted == 1 and self.cards[0].value == card.value
+        self._counted += 1
+
+    def _sync(self):
+        # `cards` may also be replaced or appended to directly; fold any
+        # cards the running totals have not seen yet.
+        cards = self.cards
+        if cards is self._tracked and len(cards) == self._counted:
+            return
+        if cards is not self._tracked or len(cards) < self._counted:
+            self._tracked = cards
+            self._hard_total = 0
+            self._aces = 0
+            self._pair = False
+            self._counted = 0
+        while self._counted < len(cards):
+            self._count(cards[self._counted])
 
     @property
     def value(self) -> int:
-        total = 0
-        aces = 0
-        for c in self.cards:
-            total += c.value
-            if c.value == 11:
-                aces += 1
-        while total > 21 and aces:
-            total -= 10
-            aces -= 1
-        return total
+        self._sync()
+        if self._aces and self._hard_total <= 11:
+            return self._hard_total + 10
+        return self._hard_total
+
+    @property
+    def is_soft(self) -> bool:
+        self._sync()
+        return self._aces > 0 and self._hard_total <= 11
+
+    @property
+    def is_pair(self) -> bool:
+        self._sync()
+        return self._pair
 
     @property
     def is_blackjack(self) -> bool:
-        return len(self.cards) == 2 and self.value == 21
+        self._sync()
+        return self._counted == 2 and self.value == 21
 
     @property
     def is_bust(self) -> bool:
-        return self.value > 21
+        self._sync()
+        return self._hard_total > 21
 
 
-@dataclass
+@dataclass(slots=True)
 class BetHand:
     hand: Hand = field(default_factory=Hand)
     bet: int = 0
     is_finished: bool = False
     doubled: bool = False
+    is_split: bool = False
+    surrendered: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     name: str
     hands: List[BetHand] = field(default_factory=list)
@@ -0,0 +1,88 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.rng import derive_seed, new_seed
+from engine.rules import RuleSet
+from engine.simulation import (
+    PrecisionTarget, Progress, RoundSimulator, SimulationResult, Strategy, simulation_rules,
+)
+from engine.strategy import basic_strategy
+
+
+DEFAULT_SHARDS = 64
+
+
+def shard_sizes(rounds: int, shards: int) -> list[int]:
+    """Splits `rounds` into `shards` near-equal parts, larger parts first."""
+    shards = max(1, min(shards, rounds))
+    base, extra = divmod(rounds, shards)
+    return [base + 1 if i < extra else base for i in range(shards)]
+
+
+def _run_shard(args) -> SimulationResult:
+    strategy, bets, rules, seed, rounds = args
+    simulator = RoundSimulator(strategy=strategy, bets=bets, seed=seed, rules=rules)
+    return simulator.run(rounds)
+
+
+def _merge_in_order(result, shard_results, target, progress):
+    for shard_result in shard_results:
+        result.merge(shard_result)
+        if progress is not None:
+            progress(result)
+        if target is not None and target.reached(result):
+            result.target_reached = True
+            return
+
+
+def run_parallel(
+    rounds: int,
+    strategy: Strategy = basic_strategy,
+    bets: tuple[int, ...] = (10,),
+    num_decks: int | None = None,
+    penetration: float | None = None,
+    seed: int | None = None,
+    shards: int = DEFAULT_SHARDS,
+    workers: int | None = None,
+    rules: RuleSet | None = None,
+    target: PrecisionTarget | None = None,
+    progress: Progress | None = None,
+) -> SimulationResult:
+    """
+    Runs a simulation split into shards across a process pool.
+
+    Each shard plays its own shoe seeded from (seed, shard index), and shard
+    results are merged in shard order. The statistics therefore depend only
+    on rounds, shards and seed, never on the number of workers. The strategy
+    must be picklable (a module-level function). Deck count and penetration
+    default to six decks at 75%, or come from `rules`.
+
+    `progress` is called and `target` checked after each merged shard. A
+    run that reaches its target keeps the shards merged so far and cancels
+    the rest, so early stopping stays independent of the worker count too.
+    """
+    if rounds < 1:
+        raise ValueError("Need at least one round")
+    if seed is None:
+        seed = new_seed()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    rules = simulation_rules(num_decks, penetration, rules)
+
+    jobs = [
+        (strategy, tuple(bets), rules, derive_seed(seed, index), size)
+        for index, size in enumerate(shard_sizes(rounds, shards))
+    ]
+
+    result = SimulationResult(seed=seed)
+    start = time.perf_counter()
+    if workers == 1:
+        _merge_in_order(result, map(_run_shard, jobs), target, progress)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _merge_in_order(result, pool.map(_run_shard, jobs), target, progress)
+            pool.shutdown(cancel_futures=True)
+    # Report wall-clock time, not the summed time of the shards
+    result.elapsed = time.perf_counter() - start
+    return result
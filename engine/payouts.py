@@ -1,15 +1,25 @@
 from dataclasses import dataclass
 
 from engine.enums import GameResult
+from engine.rules import DEFAULT_RULES, RuleSet
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HandOutcome:
     result: GameResult
     payout: int  # Net payout for the hand (negative for losses)
 
 
+_PUSH = HandOutcome(GameResult.PUSH, 0)
+
+
 class PayoutResolver:
+    __slots__ = ("rules", "_blackjack_numerator", "_blackjack_denominator")
+
+    def __init__(self, rules: RuleSet = DEFAULT_RULES):
+        self.rules = rules
+        self._blackjack_numerator, self._blackjack_denominator = rules.blackjack_payout
+
     def resolve_hand(self, bet_hand, dealer_hand) -> HandOutcome:
         hand = bet_hand.hand
         bet_amount = bet_hand.bet
@@ -17,6 +27,13 @@ class PayoutResolver:
         player_blackjack = hand.is_blackjack
         dealer_blackjack = dealer_hand.is_blackjack
 
+        # Late surrender: the dealer has no peek, so a surrender only saves
+        # half the bet if the dealer turns out not to have a natural
+        if bet_hand.surrendered:
+            if dealer_blackjack:
+                return HandOutcome(GameResult.LOSE, -bet_amount)
+            return HandOutcome(GameResult.SURRENDER, -(bet_amount // 2))
+
         if hand.is_bust:
             return HandOutcome(GameResult.LOSE, -bet_amount)
 
@@ -28,7 +45,8 @@ class PayoutResolver:
             if player_blackjack and dealer_blackjack:
                 return HandOutcome(GameResult.PUSH, 0)
             if player_blackjack:
-                blackjack_payout = (bet_amount * 3) // 2  # 3:2 payout
+                # 3:2 by default, 6:5 on short-paying tables
+                blackjack_payout = (bet_amount * self._blackjack_numerator) // self._blackjack_denominator
                 return HandOutcome(GameResult.BLACKJACK_WIN, blackjack_payout)
             return HandOutcome(GameResult.LOSE, -bet_amount)
 
@@ -37,3 +55,51 @@ class PayoutResolver:
         if hand.value < dealer_hand.value:
             return HandOutcome(GameResult.LOSE, -bet_amount)
         return HandOutcome(GameResult.PUSH, 0)
+
+    def settle_table(self, players, dealer_hand) -> list[list[HandOutcome]]:
+        """
+        Settles every hand of every player against the dealer in one pass,
+        with the same precedence as resolve_hand. The dealer is summarized
+        once and each player hand's value is read once. Returns outcomes per
+        player in seat order; pushes share one HandOutcome instance.
+        """
+        dealer_bust = dealer_hand.is_bust
+        dealer_blackjack = dealer_hand.is_blackjack
+        dealer_value = dealer_hand.value
+        numerator = self._blackjack_numerator
+        denominator = self._blackjack_denominator
+        win, lose, blackjack_win = GameResult.WIN, GameResult.LOSE, GameResult.BLACKJACK_WIN
+
+        results = []
+        for player in players:
+            outcomes = []
+            for bet_hand in player.hands:
+                bet = bet_hand.bet
+                if bet_hand.surrendered:
+                    if dealer_blackjack:
+                        outcomes.append(HandOutcome(lose, -bet))
+                    else:
+                        outcomes.append(HandOutcome(GameResult.SURRENDER, -(bet // 2)))
+                    continue
+
+                hand = bet_hand.hand
+                value = hand.value
+                # A hand's value only exceeds 21 once its hard total does
+                if value > 21:
+                    outcome = HandOutcome(lose, -bet)
+                elif dealer_bust:
+                    outcome = HandOutcome(win, bet)
+                elif value == 21 and hand.is_blackjack:
+                    if dealer_blackjack:
+                        outcome = _PUSH
+                    else:
+                        outcome = HandOutcome(blackjack_win, (bet * numerator) // denominator)
+                elif dealer_blackjack or value < dealer_value:
+                    outcome = HandOutcome(lose, -bet)
+                elif value > dealer_value:
+                    outcome = HandOutcome(win, bet)
+                else:
+                    outcome = _PUSH
+                outcomes.append(outcome)
+            results.append(outcomes)
+        return results
@@ -0,0 +1,117 @@
+"""
+Exact dealer outcome probabilities computed by recursing over the shoe
+composition.
+
+A composition is a tuple of 10 counts: index 0 holds aces, index 1 to 8
+hold the 2s to 9s and index 9 holds all ten-valued cards.
+"""
+from functools import lru_cache
+from typing import Iterable
+
+from engine.models import Card
+
+
+BLACKJACK = "blackjack"
+BUST = "bust"
+# Order of the probabilities returned by the internal recursion
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, BLACKJACK, BUST)
+
+DEALER_CACHE_SIZE = 1 << 18
+
+_ZERO = (0.0,) * len(DEALER_OUTCOMES)
+
+
+def composition_index(value: int) -> int:
+    """Position of a card value (aces as 11) in a composition tuple."""
+    return 0 if value == 11 else value - 1
+
+
+def index_value(index: int) -> int:
+    return 11 if index == 0 else index + 1
+
+
+def shoe_composition(num_decks: int = 1) -> tuple[int, ...]:
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+
+def composition_of(cards: Iterable[Card]) -> tuple[int, ...]:
+    counts = [0] * 10
+    for card in cards:
+        counts[composition_index(card.value)] += 1
+    return tuple(counts)
+
+
+def remove_card(composition: tuple[int, ...], value: int) -> tuple[int, ...]:
+    index = composition_index(value)
+    if composition[index] == 0:
+        raise ValueError(f"No card of value {value} left in the composition")
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+
+def _terminal(total: int, cards: int) -> tuple[float, ...]:
+    if total > 21:
+        slot = 6
+    elif total == 21 and cards == 2:
+        slot = 5
+    else:
+        slot = total - 17
+    probabilities = [0.0] * len(DEALER_OUTCOMES)
+    probabilities[slot] = 1.0
+    return tuple(probabilities)
+
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def _dealer_outcomes(
+    hard: int, aces: bool, cards: int, composition: tuple[int, ...], hits_soft_17: bool = False
+) -> tuple[float, ...]:
+    total = hard + 10 if aces and hard <= 11 else hard
+    # Dealer hits below 17 and, with hits_soft_17, on soft 17 (TurnManager.dealer_play)
+    if total >= 17 and not (hits_soft_17 and total == 17 and aces and hard <= 11):
+        return _terminal(total, cards)
+
+    remaining = sum(composition)
+    if remaining == 0:
+        raise ValueError("Composition ran out of cards during dealer play")
+
+    result = _ZERO
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+        rest = composition[:index] + (count - 1,) + composition[index + 1:]
+        # Index i holds cards worth i + 1 towards the hard total (aces 1)
+        outcome = _dealer_outcomes(hard + index + 1, aces or index == 0, cards + 1, rest, hits_soft_17)
+        weight = count / remaining
+        result = tuple(r + weight * o for r, o in zip(result, outcome))
+    return result
+
+
+def dealer_outcome_vector(
+    upcard: int, composition: tuple[int, ...], hits_soft_17: bool = False
+) -> tuple[float, ...]:
+    """Probabilities in DEALER_OUTCOMES order; see dealer_probabilities."""
+    return _dealer_outcomes(
+        1 if upcard == 11 else upcard, upcard == 11, 1, tuple(composition), hits_soft_17
+    )
+
+
+def dealer_probabilities(upcard: int, composition: tuple[int, ...], hits_soft_17: bool = False) -> dict:
+    """
+    Exact distribution of the dealer's final hand given the upcard value
+    (aces as 11) and the composition of the unseen cards, hole card
+    included. Keys are 17 to 21, BLACKJACK and BUST.
+    """
+    return dict(zip(DEALER_OUTCOMES, dealer_outcome_vector(upcard, composition, hits_soft_17)))
+
+
+def dealer_cache_info():
+    return _dealer_outcomes.cache_info()
+
+
+def clear_dealer_cache():
+    _dealer_outcomes.cache_clear()
+
+
+def set_dealer_cache_size(maxsize: int | None):
+    """Replaces the dealer cache with an empty one holding up to `maxsize` entries."""
+    global _dealer_outcomes
+    _dealer_outcomes = lru_cache(maxsize=maxsize)(_dealer_outcomes.__wrapped__)
@@ -0,0 +1,33 @@
+import hashlib
+import random
+import secrets
+
+
+def new_seed() -> int:
+    return secrets.randbits(64)
+
+
+def make_rng(seed: int | None = None, rng: random.Random | None = None) -> tuple[int | None, random.Random]:
+    """
+    Returns (seed, generator) for a deck. An explicit generator wins and has
+    no known seed; otherwise a fresh seed is drawn so the stream can always
+    be replayed.
+    """
+    if rng is not None:
+        if seed is not None:
+            raise ValueError("Pass either a seed or a generator, not both")
+        return None, rng
+    if seed is None:
+        seed = new_seed()
+    return seed, random.Random(seed)
+
+
+def derive_seed(seed: int, stream: int) -> int:
+    # Hash (seed, stream) so neighbouring streams get unrelated generator states
+    digest = hashlib.blake2b(f"{seed}:{stream}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def spawn_seeds(seed: int, count: int) -> list[int]:
+    """Independent child seeds, e.g. one per worker process or shard."""
+    return [derive_seed(seed, stream) for stream in range(count)]
@@ -0,0 +1,90 @@
+import hashlib
+import json
+from dataclasses import astuple, dataclass
+from typing import Callable, Optional
+
+from engine.models import BetHand
+
+
+@dataclass(frozen=True, slots=True)
+class RuleSet:
+    """
+    Table rules. The defaults are the engine's classic rules: single deck,
+    blackjack pays 3:2, dealer stands on soft 17, double on any two cards
+    (after splits too), no surrender, insurance pays 2:1.
+    """
+
+    blackjack_payout: tuple[int, int] = (3, 2)
+    dealer_hits_soft_17: bool = False
+    double_after_split: bool = True
+    # Two-card totals a hand may double on; None allows any two cards
+    double_on: Optional[tuple[int, ...]] = None
+    num_decks: int = 1
+    penetration: float = 0.75
+    # Late surrender: give up half the bet on the first two cards. There is
+    # no peek, so against a dealer natural the whole bet is still lost
+    surrender: bool = False
+    insurance_payout: int = 2
+
+    def __post_init__(self):
+        numerator, denominator = self.blackjack_payout
+        if numerator <= 0 or denominator <= 0:
+            raise ValueError("Blackjack payout must be a positive ratio")
+        if self.num_decks < 1:
+            raise ValueError("Need at least one deck")
+        if not 0 < self.penetration <= 1:
+            raise ValueError("Penetration must be between 0 and 1")
+        if self.insurance_payout < 0:
+            raise ValueError("Insurance payout cannot be negative")
+        if self.double_on is not None:
+            object.__setattr__(self, "double_on", tuple(sorted(set(self.double_on))))
+
+    @property
+    def blackjack_pays(self) -> float:
+        numerator, denominator = self.blackjack_payout
+        return numerator / denominator
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable across processes and Python versions, unlike hash()."""
+        encoded = json.dumps(astuple(self), separators=(",", ":")).encode()
+        return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+DEFAULT_RULES = RuleSet()
+
+
+def _two_card_double(bet_hand: BetHand) -> bool:
+    return len(bet_hand.hand.cards) == 2 and not bet_hand.doubled
+
+
+def compile_can_double(rules: RuleSet) -> Callable[[BetHand], bool]:
+    """
+    Returns a can_double check specialized for the rules, so tables on the
+    default rules don't pay for restrictions they don't have.
+    """
+    allowed = frozenset(rules.double_on) if rules.double_on is not None else None
+    das = rules.double_after_split
+
+    if allowed is None and das:
+        return _two_card_double
+    if allowed is None:
+        return lambda bet_hand: _two_card_double(bet_hand) and not bet_hand.is_split
+    if das:
+        return lambda bet_hand: _two_card_double(bet_hand) and bet_hand.hand.value in allowed
+    return lambda bet_hand: (
+        _two_card_double(bet_hand)
+        and not bet_hand.is_split
+        and bet_hand.hand.value in allowed
+    )
+
+
+def compile_can_surrender(rules: RuleSet) -> Callable[[BetHand], bool]:
+    if not rules.surrender:
+        return lambda bet_hand: False
+    return lambda bet_hand: (
+        len(bet_hand.hand.cards) == 2
+        and not bet_hand.is_split
+        and not bet_hand.doubled
+        and not bet_hand.is_finished
+    )
@@ -0,0 +1,270 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from engine.deck import Shoe
+from engine.enums import Action
+from engine.game import BlackjackGame
+from engine.models import BetHand, Card, Player
+from engine.rules import RuleSet
+from engine.stats import RunningStats
+from engine.strategy import basic_strategy
+
+
+Strategy = Callable[[BetHand, Card, BlackjackGame], Action]
+# Returns the insurance amount a player places (0 to decline)
+InsuranceStrategy = Callable[[Player, BlackjackGame], int]
+# Called with the running result whenever a run checks its progress
+Progress = Callable[["SimulationResult"], None]
+
+# Rounds between progress reports and precision checks
+CHECK_EVERY = 1000
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    rounds: int = 0
+    hands: int = 0
+    initial_wagered: int = 0  # Sum of starting bets
+    net: int = 0  # Net payout to the players, insurance included
+    outcomes: Counter = field(default_factory=Counter)  # GameResult -> hands
+    round_net: RunningStats = field(default_factory=RunningStats)  # Net per round
+    round_histogram: Counter = field(default_factory=Counter)  # Net per round -> rounds
+    elapsed: float = 0.0
+    seed: int | None = None
+    target_reached: bool = False  # Stopped early on a PrecisionTarget
+
+    def merge(self, other: "SimulationResult"):
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.initial_wagered += other.initial_wagered
+        self.net += other.net
+        self.outcomes.update(other.outcomes)
+        self.round_net.merge(other.round_net)
+        self.round_histogram.update(other.round_histogram)
+        self.elapsed += other.elapsed
+
+    @property
+    def ev_per_round(self) -> float:
+        return self.net / self.rounds if self.rounds else 0.0
+
+    @property
+    def variance_per_round(self) -> float:
+        return self.round_net.variance
+
+    @property
+    def ev_per_unit(self) -> float:
+        """Player EV per unit of starting bet (negative of the house edge)."""
+        return self.net / self.initial_wagered if self.initial_wagered else 0.0
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.elapsed if self.elapsed else 0.0
+
+    def stderr(self, per_unit: bool = False) -> float:
+        """Standard error of EV per round, or per unit of starting bet."""
+        if per_unit and self.rounds:
+            return self.round_net.stderr * self.rounds / self.initial_wagered
+        return self.round_net.stderr
+
+    def confidence_interval(self, confidence: float = 0.95, per_unit: bool = False) -> tuple[float, float]:
+        """CI for EV per round, or per unit of starting bet with per_unit=True."""
+        low, high = self.round_net.confidence_interval(confidence)
+        if per_unit and self.rounds:
+            stake = self.initial_wagered / self.rounds
+            return low / stake, high / stake
+        return low, high
+
+
+@dataclass(frozen=True, slots=True)
+class PrecisionTarget:
+    """
+    Stops a run once the EV estimate is precise enough: its standard error
+    is at most `stderr`, or its confidence interval at most `ci_width` wide.
+    per_unit measures both per unit of starting bet instead of per round.
+    """
+
+    stderr: float | None = None
+    ci_width: float | None = None
+    confidence: float = 0.95
+    per_unit: bool = False
+    # The variance estimate is unreliable over the first few rounds
+    min_rounds: int = 1000
+
+    def __post_init__(self):
+        if self.stderr is None and self.ci_width is None:
+            raise ValueError("Set a target stderr or ci_width")
+
+    def reached(self, result: SimulationResult) -> bool:
+        if result.rounds < max(self.min_rounds, 2):
+            return False
+        if self.stderr is not None and result.stderr(self.per_unit) <= self.stderr:
+            return True
+        if self.ci_width is not None:
+            low, high = result.confidence_interval(self.confidence, self.per_unit)
+            return high - low <= self.ci_width
+        return False
+
+
+def simulation_rules(
+    num_decks: int | None = None,
+    penetration: float | None = None,
+    rules: RuleSet | None = None,
+) -> RuleSet:
+    """Simulations default to a six-deck shoe dealt to 75%."""
+    if rules is None:
+        return RuleSet(
+            num_decks=6 if num_decks is None else num_decks,
+            penetration=0.75 if penetration is None else penetration,
+        )
+    if num_decks is not None or penetration is not None:
+        raise ValueError("Set the deck count and penetration on the RuleSet")
+    return rules
+
+
+def play_round(
+    game: BlackjackGame,
+    strategy: Strategy,
+    insurance: Optional[InsuranceStrategy] = None,
+):
+    """
+    Plays the dealt round in `game` to completion and settles it.
+    Returns (insurance_results, bet_results) as from resolve_insurance and
+    resolve_bets.
+    """
+    if insurance is not None and game.insurance.is_available(game.dealer_hand):
+        for player in game.players:
+            amount = insurance(player, game)
+            if amount:
+                game.place_insurance(player, amount)
+
+    upcard = game.dealer_hand.cards[0]
+    while game.current_player_index is not None:
+        player = game.players[game.current_player_index]
+        hand_index = next(i for i, h in enumerate(player.hands) if not h.is_finished)
+        bet_hand = player.hands[hand_index]
+        action = strategy(bet_hand, upcard, game)
+
+        if action is Action.DOUBLE and not game.turns.can_double(bet_hand):
+            action = Action.HIT
+        elif action is Action.SURRENDER and not game.turns.can_surrender(bet_hand):
+            action = Action.HIT
+
+        if action is Action.HIT:
+            game.hit(player, hand_index)
+        elif action is Action.STAND:
+            game.stand(player, hand_index)
+        elif action is Action.DOUBLE:
+            game.double(player, hand_index)
+        elif action is Action.SPLIT:
+            game.split_hand(player, hand_index)
+        elif action is Action.SURRENDER:
+            game.surrender(player, hand_index)
+        else:
+            raise ValueError(f"Unknown action: {action!r}")
+
+    game.play_dealer()
+    return game.resolve_insurance(), game.resolve_bets()
+
+
+class RoundSimulator:
+    """
+    Plays complete rounds headlessly through BlackjackGame, so every rule
+    comes from the real managers. One game and one shoe are reused for all
+    rounds; only the hands are rebuilt per round.
+
+    The shoe comes from num_decks and penetration (six decks, 75% by
+    default) or from `rules`, not both.
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy = basic_strategy,
+        bets: tuple[int, ...] = (10,),
+        num_decks: int | None = None,
+        penetration: float | None = None,
+        seed: int | None = None,
+        insurance: Optional[InsuranceStrategy] = None,
+        rules: RuleSet | None = None,
+    ):
+        if not bets:
+            raise ValueError("Need at least one seat")
+        rules = simulation_rules(num_decks, penetration, rules)
+
+        self.strategy = strategy
+        self.insurance = insurance
+        self.bets = list(bets)
+        self.rules = rules
+        self.shoe = Shoe(num_decks=rules.num_decks, penetration=rules.penetration, seed=seed, lazy=True)
+        self.game = BlackjackGame(
+            [(f"Seat {i + 1}", bet) for i, bet in enumerate(bets)],
+            shoe=self.shoe,
+            rules=rules,
+        )
+        self._round_pending = True  # The constructor already dealt a round
+
+    @property
+    def seed(self) -> int | None:
+        return self.shoe.seed
+
+    def run(
+        self,
+        rounds: int,
+        target: PrecisionTarget | None = None,
+        progress: Progress | None = None,
+        check_every: int = CHECK_EVERY,
+    ) -> SimulationResult:
+        """
+        Plays `rounds` rounds, or fewer if `target` is reached first; the
+        target and `progress` are checked every `check_every` rounds.
+        """
+        result = SimulationResult(seed=self.seed)
+        if target is None and progress is None:
+            self._play(rounds, result)
+            return result
+
+        remaining = rounds
+        while remaining > 0:
+            chunk = min(remaining, check_every)
+            self._play(chunk, result)
+            remaining -= chunk
+            if progress is not None:
+                progress(result)
+            if target is not None and target.reached(result):
+                result.target_reached = True
+                break
+        return result
+
+    def _play(self, rounds: int, result: SimulationResult):
+        game = self.game
+        strategy = self.strategy
+        insurance = self.insurance
+        bets = self.bets
+        round_stake = sum(bets)
+        outcomes = result.outcomes
+        round_net = result.round_net
+        round_histogram = result.round_histogram
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            if self._round_pending:
+                self._round_pending = False
+            else:
+                game.new_round(bets)
+
+            insurance_results, bet_results = play_round(game, strategy, insurance)
+
+            net = sum(insurance_results.values())
+            for player_results in bet_results:
+                for outcome in player_results:
+                    net += outcome.payout
+                    outcomes[outcome.result] += 1
+                    result.hands += 1
+            result.net += net
+            round_net.add(net)
+            round_histogram[net] += 1
+        result.elapsed += time.perf_counter() - start
+
+        result.rounds += rounds
+        result.initial_wagered += rounds * round_stake
@@ -0,0 +1,266 @@
+"""
+Versioned compact binary snapshots of a BlackjackGame.
+
+Cards are stored as their one-byte engine.cards id, so only canonical
+cards (from CARDS) can be encoded. The deck is stored as its remaining
+cards in dealing order; a lazily shuffled deck is materialized first,
+which deals exactly the cards it would have dealt anyway.
+
+The generator state is not stored (it alone would be 2.5KB). A restored
+deck shuffles its next rounds with a generator seeded from the game seed
+and the number of cards left, so seeded games stay reproducible.
+
+Layout (little-endian), version 3:
+    magic "BJ", version u8
+    game version: u32
+    rules: u8 flag, then for non-default rules the RuleSet fields
+    deck: u8 kind (0 deck, 1 shoe), seed, tags, [shoe fields], u16 count + card ids,
+        u8 count + ids of face-down cards not counted yet
+    dealer: u8 count + card ids
+    current player: u8 (255 = None)
+    players: u8 count, per player name, balance, insurance bet and hands
+"""
+import random
+import struct
+
+from engine.cards import CARDS
+from engine.counting import HI_LO
+from engine.deck import Deck, Shoe
+from engine.game import BlackjackGame
+from engine.models import BetHand, Hand, Player
+from engine.rng import derive_seed
+from engine.rules import DEFAULT_RULES, RuleSet
+
+
+MAGIC = b"BJ"
+VERSION = 3
+
+_NONE = 255
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_RULES = struct.Struct("<BBBBdB")  # payout num, den, flags, decks, penetration, insurance
+_SHOE = struct.Struct("<BdHB")  # decks, penetration, cut card, cut card reached
+_PLAYER = struct.Struct("<qIB")  # balance, insurance bet, hands
+_HAND = struct.Struct("<IBB")  # bet, flags, cards
+_TAGS = struct.Struct("<10b")
+
+_H17, _DAS, _SURRENDER = 1, 2, 4
+_FINISHED, _DOUBLED, _SPLIT, _SURRENDERED = 1, 2, 4, 8
+# Seed encodings
+_NO_SEED, _SEED_U64, _SEED_TEXT = 0, 1, 2
+
+
+def _card_ids(cards) -> bytes:
+    try:
+        return bytes([card.id for card in cards])
+    except ValueError:
+        raise ValueError("Only canonical cards (engine.cards.CARDS) can be encoded") from None
+
+
+def _encode_rules(out: bytearray, rules: RuleSet):
+    if rules == DEFAULT_RULES:
+        out += b"\x00"
+        return
+    numerator, denominator = rules.blackjack_payout
+    flags = (
+        (_H17 if rules.dealer_hits_soft_17 else 0)
+        | (_DAS if rules.double_after_split else 0)
+        | (_SURRENDER if rules.surrender else 0)
+    )
+    out += b"\x01"
+    out += _RULES.pack(numerator, denominator, flags, rules.num_decks, rules.penetration, rules.insurance_payout)
+    if rules.double_on is None:
+        out += _U8.pack(_NONE)
+    else:
+        out += _U8.pack(len(rules.double_on)) + bytes(rules.double_on)
+
+
+def _encode_seed(out: bytearray, seed):
+    if seed is None:
+        out += _U8.pack(_NO_SEED)
+    elif 0 <= seed < 1 << 64:
+        out += _U8.pack(_SEED_U64) + _U64.pack(seed)
+    else:
+        text = str(seed).encode()
+        out += _U8.pack(_SEED_TEXT) + _U8.pack(len(text)) + text
+
+
+def _encode_deck(out: bytearray, deck: Deck):
+    deck.materialize()
+    is_shoe = isinstance(deck, Shoe)
+    out += _U8.pack(1 if is_shoe else 0)
+    _encode_seed(out, deck.seed)
+    if deck.tags == HI_LO:
+        out += b"\x00"
+    else:
+        out += b"\x01" + _TAGS.pack(*deck.tags)
+    if is_shoe:
+        out += _SHOE.pack(deck.num_decks, deck.penetration, deck.cut_card, deck.cut_card_reached)
+    out += _U16.pack(len(deck.cards)) + _card_ids(deck.cards)
+    _encode_cards(out, deck.hidden)
+
+
+def _encode_cards(out: bytearray, cards):
+    out += _U8.pack(len(cards)) + _card_ids(cards)
+
+
+def encode_game(game: BlackjackGame) -> bytes:
+    """
+    Snapshot of the full game. A lazily shuffled deck is put into dealing
+    order first; the game deals the same cards afterwards.
+    """
+    out = bytearray(MAGIC)
+    out += _U8.pack(VERSION)
+    try:
+        out += _U32.pack(game.version)
+        _encode_rules(out, game.rules)
+        _encode_deck(out, game.deck)
+        _encode_cards(out, game.dealer_hand.cards)
+        index = game.current_player_index
+        out += _U8.pack(_NONE if index is None else index)
+        out += _U8.pack(len(game.players))
+        for player in game.players:
+            name = player.name.encode()
+            out += _U8.pack(len(name)) + name
+            out += _PLAYER.pack(player.balance, player.insurance_bet, len(player.hands))
+            for bet_hand in player.hands:
+                flags = (
+                    (_FINISHED if bet_hand.is_finished else 0)
+                    | (_DOUBLED if bet_hand.doubled else 0)
+                    | (_SPLIT if bet_hand.is_split else 0)
+                    | (_SURRENDERED if bet_hand.surrendered else 0)
+                )
+                cards = bet_hand.hand.cards
+                out += _HAND.pack(bet_hand.bet, flags, len(cards)) + _card_ids(cards)
+    except struct.error as e:
+        raise ValueError(f"Game does not fit the snapshot format: {e}") from None
+    return bytes(out)
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def unpack(self, fmt: struct.Struct):
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def u8(self) -> int:
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def take(self, size: int) -> bytes:
+        chunk = self.data[self.pos:self.pos + size]
+        if len(chunk) != size:
+            raise ValueError("Snapshot is truncated")
+        self.pos += size
+        return chunk
+
+    def cards(self, count: int) -> list:
+        return [CARDS[card_id] for card_id in self.take(count)]
+
+
+def _decode_rules(reader: _Reader) -> RuleSet:
+    if not reader.u8():
+        return DEFAULT_RULES
+    numerator, denominator, flags, num_decks, penetration, insurance = reader.unpack(_RULES)
+    count = reader.u8()
+    double_on = None if count == _NONE else tuple(reader.take(count))
+    return RuleSet(
+        blackjack_payout=(numerator, denominator),
+        dealer_hits_soft_17=bool(flags & _H17),
+        double_after_split=bool(flags & _DAS),
+        double_on=double_on,
+        num_decks=num_decks,
+        penetration=penetration,
+        surrender=bool(flags & _SURRENDER),
+        insurance_payout=insurance,
+    )
+
+
+def _decode_seed(reader: _Reader):
+    kind = reader.u8()
+    if kind == _NO_SEED:
+        return None
+    if kind == _SEED_U64:
+        return reader.unpack(_U64)[0]
+    return int(reader.take(reader.u8()).decode())
+
+
+def _decode_deck(reader: _Reader) -> Deck:
+    is_shoe = reader.u8()
+    deck = Shoe.__new__(Shoe) if is_shoe else Deck.__new__(Deck)
+    deck.seed = _decode_seed(reader)
+    deck.tags = reader.unpack(_TAGS) if reader.u8() else HI_LO
+    if is_shoe:
+        deck.num_decks, deck.penetration, deck.cut_card, cut_card_reached = reader.unpack(_SHOE)
+        deck.cut_card_reached = bool(cut_card_reached)
+        deck._all_cards = deck._create()
+        deck._round_cards = []
+    (count,) = reader.unpack(_U16)
+    deck.cards = reader.cards(count)
+    deck._hidden = reader.cards(reader.u8())
+    deck.lazy = False
+    # Later shuffles: reproducible for seeded games, fresh otherwise
+    deck.rng = random.Random(None if deck.seed is None else derive_seed(deck.seed, count))
+    deck.recount()
+    return deck
+
+
+def decode_game(data: bytes) -> BlackjackGame:
+    if data[:2] != MAGIC:
+        raise ValueError("Not a game snapshot")
+    reader = _Reader(data)
+    reader.pos = 2
+    version = reader.u8()
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+
+    try:
+        (game_version,) = reader.unpack(_U32)
+        rules = _decode_rules(reader)
+        deck = _decode_deck(reader)
+        dealer_hand = Hand(cards=reader.cards(reader.u8()))
+        index = reader.u8()
+        players = []
+        for _ in range(reader.u8()):
+            name = reader.take(reader.u8()).decode()
+            balance, insurance_bet, hand_count = reader.unpack(_PLAYER)
+            hands = []
+            for _ in range(hand_count):
+                bet, flags, card_count = reader.unpack(_HAND)
+                hands.append(BetHand(
+                    hand=Hand(cards=reader.cards(card_count)),
+                    bet=bet,
+                    is_finished=bool(flags & _FINISHED),
+                    doubled=bool(flags & _DOUBLED),
+                    is_split=bool(flags & _SPLIT),
+                    surrendered=bool(flags & _SURRENDERED),
+                ))
+            players.append(Player(name, hands, insurance_bet=insurance_bet, balance=balance))
+    except (struct.error, IndexError):
+        raise ValueError("Snapshot is truncated") from None
+
+    if isinstance(deck, Shoe):
+        # Cards on the table must not come back if the shoe runs dry this round
+        deck._round_cards = dealer_hand.cards + [
+            card for player in players for bet_hand in player.hands for card in bet_hand.hand.cards
+        ]
+
+    game = BlackjackGame.__new__(BlackjackGame)
+    game.__setstate__({
+        "deck": deck,
+        "players": players,
+        "dealer_hand": dealer_hand,
+        "current_player_index": None if index == _NONE else index,
+        "rules": rules,
+        "version": game_version,
+    })
+    return game
@@ -2,9 +2,10 @@ from engine.models import BetHand, Hand
 
 
 class SplitManager:
+    __slots__ = ()
+
     def can_split(self, bet_hand: BetHand) -> bool:
-        cards = bet_hand.hand.cards
-        return len(cards) == 2 and cards[0].value == cards[1].value
+        return bet_hand.hand.is_pair
 
     def split(self, bet_hand: BetHand) -> tuple[BetHand, BetHand]:
         if not self.can_split(bet_hand):
@@ -12,7 +13,7 @@ class SplitManager:
 
         c1, c2 = bet_hand.hand.cards
 
-        h1 = BetHand(hand=Hand(cards=[c1]), bet=bet_hand.bet)
-        h2 = BetHand(hand=Hand(cards=[c2]), bet=bet_hand.bet)
+        h1 = BetHand(hand=Hand(cards=[c1]), bet=bet_hand.bet, is_split=True)
+        h2 = BetHand(hand=Hand(cards=[c2]), bet=bet_hand.bet, is_split=True)
 
         return h1, h2
@@ -0,0 +1,51 @@
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+
+
+@dataclass(slots=True)
+class RunningStats:
+    """
+    Streaming mean/variance (Welford). merge() combines two accumulators
+    (Chan et al.), so shards can be summarized separately and merged.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: "RunningStats"):
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        return math.sqrt(self.variance / self.count) if self.count else 0.0
+
+    def confidence_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        half_width = z * self.stderr
+        return self.mean - half_width, self.mean + half_width
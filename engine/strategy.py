@@ -0,0 +1,82 @@
+from engine.enums import Action
+from engine.models import BetHand, Card
+
+
+# Multi-deck basic strategy for the engine's rules (dealer stands on soft
+# 17, double on any two cards, double after split). Each row lists the
+# action against dealer upcards 2, 3, 4, 5, 6, 7, 8, 9, 10, Ace.
+#   H = hit, S = stand, D = double (else hit), Ds = double (else stand),
+#   P = split
+_HARD = {
+    8: "H H H H H H H H H H",
+    9: "H D D D D H H H H H",
+    10: "D D D D D D D D H H",
+    11: "D D D D D D D D D H",
+    12: "H H S S S H H H H H",
+    13: "S S S S S H H H H H",
+    14: "S S S S S H H H H H",
+    15: "S S S S S H H H H H",
+    16: "S S S S S H H H H H",
+    17: "S S S S S S S S S S",
+}
+_SOFT = {
+    13: "H H H D D H H H H H",
+    14: "H H H D D H H H H H",
+    15: "H H D D D H H H H H",
+    16: "H H D D D H H H H H",
+    17: "H D D D D H H H H H",
+    18: "S Ds Ds Ds Ds S S H H H",
+    19: "S S S S S S S S S S",
+}
+_PAIRS = {
+    2: "P P P P P P H H H H",
+    3: "P P P P P P H H H H",
+    4: "H H H P P H H H H H",
+    6: "P P P P P H H H H H",
+    7: "P P P P P P H H H H",
+    8: "P P P P P P P P P P",
+    9: "P P P P P S P P S S",
+    11: "P P P P P P P P P P",
+}
+
+
+def _table(rows: dict[int, str]) -> dict[int, tuple[str, ...]]:
+    return {total: tuple(row.split()) for total, row in rows.items()}
+
+
+_HARD_TABLE = _table(_HARD)
+_SOFT_TABLE = _table(_SOFT)
+_PAIR_TABLE = _table(_PAIRS)
+
+
+def _lookup(table: dict[int, tuple[str, ...]], total: int) -> tuple[str, ...]:
+    lowest, highest = min(table), max(table)
+    return table[min(max(total, lowest), highest)]
+
+
+def basic_strategy(bet_hand: BetHand, dealer_upcard: Card, game=None) -> Action:
+    hand = bet_hand.hand
+    column = dealer_upcard.value - 2
+    two_cards = len(hand.cards) == 2
+
+    if two_cards and hand.is_pair and hand.cards[0].value in _PAIR_TABLE:
+        if _PAIR_TABLE[hand.cards[0].value][column] == "P":
+            return Action.SPLIT
+
+    if hand.is_soft:
+        code = _lookup(_SOFT_TABLE, hand.value)[column]
+    else:
+        code = _lookup(_HARD_TABLE, hand.value)[column]
+
+    if code == "D":
+        return Action.DOUBLE if two_cards and not bet_hand.doubled else Action.HIT
+    if code == "Ds":
+        return Action.DOUBLE if two_cards and not bet_hand.doubled else Action.STAND
+    if code == "S":
+        return Action.STAND
+    return Action.HIT
+
+
+def dealer_strategy(bet_hand: BetHand, dealer_upcard: Card, game=None) -> Action:
+    # Mimic the dealer: hit below 17, never double or split
+    return Action.HIT if bet_hand.hand.value < 17 else Action.STAND
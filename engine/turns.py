@@ -1,7 +1,27 @@
 from engine.enums import TurnResult
+from engine.rules import DEFAULT_RULES, RuleSet, compile_can_double, compile_can_surrender
+
+
+def _dealer_stands_soft_17(dealer_hand, deck):
+    while dealer_hand.value < 17:
+        dealer_hand.add(deck.draw())
+
+
+def _dealer_hits_soft_17(dealer_hand, deck):
+    while dealer_hand.value < 17 or (dealer_hand.value == 17 and dealer_hand.is_soft):
+        dealer_hand.add(deck.draw())
 
 
 class TurnManager:
+    # Rule checks are picked once per RuleSet rather than branched on per hand
+    __slots__ = ("rules", "can_double", "can_surrender", "dealer_play")
+
+    def __init__(self, rules: RuleSet = DEFAULT_RULES):
+        self.rules = rules
+        self.can_double = compile_can_double(rules)
+        self.can_surrender = compile_can_surrender(rules)
+        self.dealer_play = _dealer_hits_soft_17 if rules.dealer_hits_soft_17 else _dealer_stands_soft_17
+
     def hit(self, bet_hand, deck):
         bet_hand.hand.add(deck.draw())
 
@@ -15,12 +35,6 @@ class TurnManager:
         bet_hand.is_finished = True
         return TurnResult.STAND
 
-    def can_double(self, bet_hand) -> bool:
-        return (
-            len(bet_hand.hand.cards) == 2
-            and not bet_hand.doubled
-        )
-
     def double(self, bet_hand, deck):
         if not self.can_double(bet_hand):
             raise ValueError("Cannot double this hand")
@@ -36,6 +50,10 @@ class TurnManager:
 
         return TurnResult.DOUBLE
 
-    def dealer_play(self, dealer_hand, deck):
-        while dealer_hand.value < 17:
-            dealer_hand.add(deck.draw())
+    def surrender(self, bet_hand):
+        if not self.can_surrender(bet_hand):
+            raise ValueError("Cannot surrender this hand")
+
+        bet_hand.surrendered = True
+        bet_hand.is_finished = True
+        return TurnResult.SURRENDER
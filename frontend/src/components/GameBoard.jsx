@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import './GameBoard.css';
 import Card from './Card';
 import { API_BASE_URL } from '../config';
@@ -8,6 +8,7 @@ function GameBoard({ gameId, initialGameState, onReset }) {
   const [loading, setLoading] = useState(false);
   const [insuranceAmount, setInsuranceAmount] = useState('');
   const [showInsurance, setShowInsurance] = useState(false);
+  const resolvingRef = useRef(false);
 
   const formatCurrency = (amount) => {
     if (amount === 0) return '$0';
@@ -37,23 +38,65 @@ function GameBoard({ gameId, initialGameState, onReset }) {
     }
   }, [gameState?.current_player_index]);
 
+  useEffect(() => {
+    // Other seats' moves are pushed by the server instead of polled
+    const events = new EventSource(`${API_BASE_URL}/api/game/${gameId}/events`);
+    events.addEventListener('state', (event) => {
+      if (resolvingRef.current) return;
+      const data = JSON.parse(event.data);
+      // Keep final results and never step back to an older version
+      setGameState((gs) => (gs.results || data.version <= gs.version ? gs : data));
+    });
+    return () => events.close();
+  }, [gameId]);
+
   useEffect(() => {
     if (gameState?.game_over && !gameState.results) {
       resolveGame();
     }
   }, [gameState]);
 
+  // Merges a delta response into the state it was computed against
+  const applyDelta = (gs, delta) => {
+    // A pushed update already moved past the delta's base version
+    if (gs.version !== delta.since_version) return gs;
+    const players = [...gs.players];
+    for (const change of delta.players) {
+      const player = players[change.index];
+      players[change.index] = {
+        ...player,
+        balance: change.balance,
+        insurance_bet: change.insurance_bet,
+        hands: [...player.hands.slice(0, change.hands_from), ...change.hands],
+      };
+    }
+    return {
+      ...gs,
+      players,
+      version: delta.version,
+      current_player_index: delta.current_player_index,
+      game_over: delta.game_over,
+      ...(delta.dealer_hand && { dealer_hand: delta.dealer_hand, dealer_value: delta.dealer_value }),
+    };
+  };
+
   const makeAction = async (action, playerIndex, handIndex = 0, extraData = {}) => {
     setLoading(true);
     try {
-      const body = { game_id: gameId, player_index: playerIndex, hand_index: handIndex, ...extraData };
+      const body = {
+        game_id: gameId,
+        player_index: playerIndex,
+        hand_index: handIndex,
+        since_version: gameState.version,
+        ...extraData
+      };
       const response = await fetch(`${API_BASE_URL}/api/game/${gameId}/${action}`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(body)
       });
       const data = await response.json();
-      setGameState(data);
+      setGameState((gs) => (data.delta ? applyDelta(gs, data) : data));
     } catch (error) {
       console.error(`Error during ${action}:`, error);
     } finally {
@@ -62,6 +105,7 @@ function GameBoard({ gameId, initialGameState, onReset }) {
   };
 
   const resolveGame = async () => {
+    resolvingRef.current = true;
     try {
       setLoading(true);
       const response = await fetch(`${API_BASE_URL}/api/game/${gameId}/resolve`, {
@@ -111,6 +155,7 @@ function GameBoard({ gameId, initialGameState, onReset }) {
       }
     } catch (error) {
       console.error('Error resolving game:', error);
+      resolvingRef.current = false;
     } finally {
       setLoading(false);
     }
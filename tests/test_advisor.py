@@ -0,0 +1,81 @@
+import pytest
+from engine.advisor import action_evs, ev_cache_info
+from engine.enums import Action
+from engine.game import BlackjackGame
+from engine.models import BetHand, Card
+from engine.probability import BUST, BLACKJACK, dealer_probabilities, remove_card, shoe_composition
+
+
+def _bet_hand(*values):
+    bh = BetHand(bet=10)
+    for v in values:
+        bh.hand.add(Card(str(v), v))
+    return bh
+
+
+def _composition(upcard, *values, decks=6):
+    comp = shoe_composition(decks)
+    for v in (upcard,) + values:
+        comp = remove_card(comp, v)
+    return comp
+
+
+def _best(values, upcard, can_double=True, can_split=False):
+    evs = action_evs(_bet_hand(*values), upcard, _composition(upcard, *values), can_double, can_split)
+    return max(evs, key=evs.get), evs
+
+
+class TestActionEvs:
+    def test_stand_ev_matches_dealer_distribution(self):
+        comp = _composition(10, 10, 10)
+        evs = action_evs(_bet_hand(10, 10), 10, comp, can_double=False, can_split=False)
+        probs = dealer_probabilities(10, comp)
+        expected = probs[BUST] + sum(probs[t] for t in (17, 18, 19)) - probs[21] - probs[BLACKJACK]
+        assert evs[Action.STAND] == pytest.approx(expected)
+
+    def test_only_legal_actions_are_reported(self):
+        _, evs = _best((5, 4, 2), 6, can_double=False)
+        assert set(evs) == {Action.STAND, Action.HIT}
+        _, evs = _best((8, 8), 6, can_split=True)
+        assert set(evs) == {Action.STAND, Action.HIT, Action.DOUBLE, Action.SPLIT}
+
+    def test_double_is_twice_a_single_card_stand(self):
+        _, evs = _best((6, 5), 6)
+        assert -2.0 <= evs[Action.DOUBLE] <= 2.0
+        assert evs[Action.DOUBLE] > evs[Action.HIT] > evs[Action.STAND]
+
+    def test_textbook_decisions(self):
+        assert _best((10, 10), 6)[0] == Action.STAND
+        assert _best((10, 6), 10)[0] == Action.HIT
+        assert _best((10, 2), 4)[0] == Action.STAND
+        assert _best((6, 5), 6)[0] == Action.DOUBLE
+        assert _best((11, 11), 6, can_split=True)[0] == Action.SPLIT
+        assert _best((10, 10), 6, can_split=True)[0] == Action.STAND
+
+    def test_player_blackjack_stands(self):
+        best, evs = _best((11, 10), 10)
+        assert best == Action.STAND
+        assert evs[Action.STAND] > 1.0
+
+    def test_bust_hand_can_only_stand(self):
+        evs = action_evs(_bet_hand(10, 10, 5), 6, _composition(6, 10, 10, 5), False, False)
+        assert evs == {Action.STAND: -1.0}
+
+    def test_repeated_query_is_served_from_cache(self):
+        _best((9, 3), 2)
+        hits = ev_cache_info()["hit"].hits
+        _best((9, 3), 2)
+        assert ev_cache_info()["hit"].hits == hits + 1
+
+
+class TestGameAdvice:
+    def test_unseen_composition_includes_hole_card(self):
+        game = BlackjackGame([("Alice", 10)], seed=12)
+        comp = game.advisor.unseen_composition(game)
+        assert sum(comp) == len(game.deck.cards) + 1
+
+    def test_game_advise_reports_best_action(self):
+        game = BlackjackGame([("Alice", 10), ("Bob", 10)], seed=21)
+        advice = game.advise(game.players[1], 0)
+        assert advice.best in advice.ev
+        assert advice.ev[advice.best] == max(advice.ev.values())
@@ -132,5 +132,32 @@ def test_complete_game_flow():
     assert len(data["dealer_hand"]) >= 2  # Dealer cards now visible
 
 
+def test_advice_endpoint():
+    """Test the optimal-play advice for the active hand"""
+    payload = {"players": [{"name": "Adviced", "bet": 100}]}
+    game_id = requests.post(f"{BASE_URL}/api/game/start", json=payload).json()["game_id"]
+
+    response = requests.get(
+        f"{BASE_URL}/api/game/{game_id}/advice",
+        params={"player_index": 0, "hand_index": 0},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["best"] in data["ev"]
+    assert "stand" in data["ev"]
+
+    response = requests.get(f"{BASE_URL}/api/game/{game_id}/advice", params={"player_index": 9})
+    assert response.status_code == 400
+
+
+
+def test_store_stats():
+    """Test the game store counters"""
+    response = requests.get(f"{BASE_URL}/api/store/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["games"] >= 0
+    assert {"evicted_lru", "evicted_idle"} <= set(data)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
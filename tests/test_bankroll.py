@@ -0,0 +1,85 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from engine.bankroll import (
+    NOT_RUINED, OutcomeDistribution, approximate_risk_of_ruin, simulate_bankroll,
+)
+from engine.enums import GameResult
+from engine.payouts import HandOutcome
+from engine.simulation import RoundSimulator
+
+
+def _coin(p_win):
+    return OutcomeDistribution.from_probabilities({1: p_win, -1: 1 - p_win})
+
+
+class TestOutcomeDistribution:
+    def test_from_outcomes(self):
+        outcomes = [
+            HandOutcome(GameResult.WIN, 10),
+            HandOutcome(GameResult.LOSE, -10),
+            HandOutcome(GameResult.LOSE, -10),
+            HandOutcome(GameResult.BLACKJACK_WIN, 15),
+        ]
+        dist = OutcomeDistribution.from_outcomes(outcomes)
+        assert dist.values.tolist() == [-10, 10, 15]
+        assert dist.probabilities.tolist() == [0.5, 0.25, 0.25]
+        assert dist.mean == pytest.approx(1.25)
+
+    def test_from_simulation_histogram(self):
+        result = RoundSimulator(seed=6).run(2000)
+        dist = OutcomeDistribution.from_histogram(result.round_histogram)
+        assert dist.mean == pytest.approx(result.ev_per_round)
+        assert dist.variance == pytest.approx(result.variance_per_round, rel=1e-2)
+
+    def test_rejects_empty_distribution(self):
+        with pytest.raises(ValueError):
+            OutcomeDistribution.from_probabilities({})
+
+
+class TestSimulateBankroll:
+    @pytest.mark.parametrize("block_rounds", [1, 7, 1024])
+    def test_certain_loss_ruins_on_schedule(self, block_rounds):
+        dist = OutcomeDistribution.from_probabilities({-2: 1.0})
+        result = simulate_bankroll(dist, bankroll=20, rounds=50, paths=5, block_rounds=block_rounds)
+        assert result.risk_of_ruin == 1.0
+        assert result.ruin_round.tolist() == [10] * 5
+        assert result.final.tolist() == [0] * 5
+        assert result.max_drawdown.tolist() == [20] * 5
+
+    def test_survivors_are_marked(self):
+        dist = OutcomeDistribution.from_probabilities({1: 1.0})
+        result = simulate_bankroll(dist, bankroll=5, rounds=30, paths=3)
+        assert result.risk_of_ruin == 0.0
+        assert (result.ruin_round == NOT_RUINED).all()
+        assert result.final.tolist() == [35] * 3
+        assert math.isnan(result.time_to_ruin_quantiles()[0.5])
+
+    def test_matches_gamblers_ruin(self):
+        # Ruin probability for a +-1 walk with p > 1/2: (q/p)^bankroll
+        p = 0.55
+        result = simulate_bankroll(
+            _coin(p), bankroll=10, rounds=4000, paths=20_000, rng=np.random.default_rng(1)
+        )
+        assert result.risk_of_ruin == pytest.approx((0.45 / 0.55) ** 10, abs=0.01)
+        assert result.ruin_round[result.ruined].max() <= 4000
+        quantiles = result.drawdown_quantiles((0.5, 0.99))
+        assert 0 < quantiles[0.5] <= quantiles[0.99]
+
+    def test_same_generator_seed_is_reproducible(self):
+        a = simulate_bankroll(_coin(0.5), 10, 500, paths=200, rng=np.random.default_rng(4))
+        b = simulate_bankroll(_coin(0.5), 10, 500, paths=200, rng=np.random.default_rng(4))
+        assert (a.ruin_round == b.ruin_round).all()
+        assert (a.max_drawdown == b.max_drawdown).all()
+
+    def test_rejects_bankroll_at_ruin_level(self):
+        with pytest.raises(ValueError):
+            simulate_bankroll(_coin(0.5), bankroll=0, rounds=10)
+
+
+def test_diffusion_approximation():
+    assert approximate_risk_of_ruin(_coin(0.5), 10) == 1.0
+    assert approximate_risk_of_ruin(_coin(0.55), 10) == pytest.approx(0.134, abs=0.01)
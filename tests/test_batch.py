@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from engine.batch import (
+    BLACKJACK_WIN, LOSE, PUSH, WIN,
+    dealer_play_batch, resolve_batch, settle_batch, to_game_results,
+)
+from engine.deck import Deck
+from engine.enums import GameResult
+from engine.models import BetHand, Card, Hand
+from engine.payouts import PayoutResolver
+from engine.rules import RuleSet
+from engine.turns import TurnManager
+
+VALUES = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11]
+MAX_HITS = 12
+
+
+def _card(value):
+    return Card(str(value), value)
+
+
+def _random_hand(rng, size):
+    hand = Hand()
+    for _ in range(size):
+        hand.add(_card(rng.choice(VALUES)))
+    return hand
+
+
+class TestDealerPlayBatch:
+    def test_matches_turn_manager(self):
+        rng = random.Random(3)
+        n = 3000
+        up = [rng.choice(VALUES) for _ in range(n)]
+        hole = [rng.choice(VALUES) for _ in range(n)]
+        draws = [[rng.choice(VALUES) for _ in range(MAX_HITS)] for _ in range(n)]
+
+        totals, blackjack = dealer_play_batch(up, hole, draws=draws)
+
+        tm = TurnManager()
+        for i in range(n):
+            dealer = Hand(cards=[_card(up[i]), _card(hole[i])])
+            deck = Deck()
+            deck.cards = [_card(v) for v in reversed(draws[i])]
+            tm.dealer_play(dealer, deck)
+            assert totals[i] == dealer.value
+            assert blackjack[i] == dealer.is_blackjack
+
+    def test_hits_soft_17_matches_turn_manager(self):
+        rng = random.Random(4)
+        n = 2000
+        up = [11] * n
+        hole = [rng.choice(VALUES) for _ in range(n)]
+        draws = [[rng.choice(VALUES) for _ in range(MAX_HITS)] for _ in range(n)]
+
+        totals, _ = dealer_play_batch(up, hole, draws=draws, hits_soft_17=True)
+
+        tm = TurnManager(RuleSet(dealer_hits_soft_17=True))
+        for i in range(n):
+            dealer = Hand(cards=[_card(up[i]), _card(hole[i])])
+            deck = Deck()
+            deck.cards = [_card(v) for v in reversed(draws[i])]
+            tm.dealer_play(dealer, deck)
+            assert totals[i] == dealer.value
+
+    def test_every_dealer_finishes_on_17_or_more(self):
+        rng = np.random.default_rng(1)
+        up = rng.choice([2, 3, 4, 5, 6, 7, 8, 9, 10, 11], size=5000)
+        hole = rng.choice([2, 3, 4, 5, 6, 7, 8, 9, 10, 11], size=5000)
+        totals, _ = dealer_play_batch(up, hole, rng=rng)
+        assert (totals >= 17).all()
+
+
+class TestSettleBatch:
+    def test_matches_payout_resolver(self):
+        rng = random.Random(8)
+        resolver = PayoutResolver()
+        cases = []
+        for _ in range(4000):
+            player = _random_hand(rng, rng.choice([2, 2, 3, 4]))
+            dealer = _random_hand(rng, rng.choice([2, 2, 3, 4]))
+            bet = rng.choice([1, 5, 10, 25, 33])
+            cases.append((player, dealer, bet))
+
+        codes, payouts = settle_batch(
+            [p.value for p, _, _ in cases],
+            [p.is_blackjack for p, _, _ in cases],
+            [b for _, _, b in cases],
+            [d.value for _, d, _ in cases],
+            [d.is_blackjack for _, d, _ in cases],
+        )
+
+        results = to_game_results(codes)
+        for (player, dealer, bet), result, payout in zip(cases, results, payouts.tolist()):
+            expected = resolver.resolve_hand(BetHand(hand=player, bet=bet), dealer)
+            assert result == expected.result
+            assert payout == expected.payout
+
+    def test_precedence_cases(self):
+        codes, payouts = settle_batch(
+            [22, 21, 21, 20, 18],
+            [False, True, True, False, False],
+            10,
+            [25, 21, 20, 21, 18],
+            [False, True, False, True, False],
+        )
+        assert codes.tolist() == [LOSE, PUSH, BLACKJACK_WIN, LOSE, PUSH]
+        assert payouts.tolist() == [-10, 0, 15, -10, 0]
+
+    def test_dealer_bust_beats_player_blackjack_precedence(self):
+        codes, payouts = settle_batch([21], [True], [10], [23], [False])
+        assert codes.tolist() == [WIN]
+        assert payouts.tolist() == [10]
+
+
+def test_resolve_batch_plays_and_settles():
+    rng = np.random.default_rng(4)
+    n = 1000
+    codes, payouts = resolve_batch(
+        player_totals=np.full(n, 18),
+        player_blackjack=np.zeros(n, dtype=bool),
+        bets=10,
+        dealer_up=np.full(n, 10),
+        dealer_hole=np.full(n, 7),
+        rng=rng,
+    )
+    assert set(to_game_results(codes)) == {GameResult.WIN}
+    assert payouts.sum() == 10 * n
@@ -0,0 +1,41 @@
+from engine.cards import CARDS, SUITS, RANKS, card_for
+from engine.deck import Deck, Shoe
+from engine.models import Card
+
+
+def test_card_table_has_52_unique_cards():
+    assert len(CARDS) == 52
+    assert len({c.name for c in CARDS}) == 52
+
+
+def test_card_ids_match_table_position():
+    for index, card in enumerate(CARDS):
+        assert card.id == index
+
+
+def test_cards_carry_rank_and_suit():
+    card = card_for("Queen", "Clubs")
+    assert card.name == "Queen of Clubs"
+    assert card.rank == "Queen"
+    assert card.suit == "Clubs"
+    assert card.value == 10
+
+
+def test_ad_hoc_cards_equal_canonical_cards():
+    card = card_for("Ace", "Spades")
+    assert Card("Ace of Spades", 11) == card
+    assert hash(Card("Ace of Spades", 11)) == hash(card)
+    assert Card("Ace of Spades", 1) != card
+
+
+def test_every_suit_rank_combination_present():
+    for suit in SUITS:
+        for rank, value in RANKS:
+            card = card_for(rank, suit)
+            assert card.value == value
+
+
+def test_decks_share_canonical_cards():
+    table_ids = {id(c) for c in CARDS}
+    assert all(id(c) in table_ids for c in Deck().cards)
+    assert all(id(c) in table_ids for c in Shoe(num_decks=2).cards)
@@ -0,0 +1,108 @@
+import pytest
+from engine.counting import HI_LO, KO, true_count
+from engine.deck import Deck, Shoe
+from engine.models import Card
+from engine.probability import composition_of, shoe_composition
+
+
+def _hi_lo(cards):
+    return sum(HI_LO[0 if c.value == 11 else c.value - 1] for c in cards)
+
+
+class TestDeckCounting:
+    def test_fresh_deck_has_full_composition(self):
+        deck = Deck()
+        assert deck.composition == shoe_composition(1)
+        assert deck.running_count == 0
+
+    def test_composition_tracks_draws(self):
+        deck = Deck(seed=4, lazy=True)
+        for _ in range(30):
+            deck.draw()
+            assert deck.composition == composition_of(deck.cards)
+
+    def test_running_count_matches_dealt_cards(self):
+        shoe = Shoe(num_decks=2, seed=6)
+        dealt = [shoe.draw() for _ in range(60)]
+        assert shoe.running_count == _hi_lo(dealt)
+
+    def test_balanced_count_returns_to_zero(self):
+        deck = Deck(seed=1)
+        for _ in range(52):
+            deck.draw()
+        assert deck.running_count == 0
+        assert deck.composition == (0,) * 10
+
+    def test_custom_tag_system(self):
+        deck = Deck(seed=2, tags=KO)
+        for _ in range(52):
+            deck.draw()
+        assert deck.running_count == 4  # KO is unbalanced by +4 per deck
+
+    def test_true_count_uses_decks_remaining(self):
+        shoe = Shoe(num_decks=2, seed=3)
+        for _ in range(52):
+            shoe.draw()
+        assert shoe.true_count == pytest.approx(shoe.running_count)
+
+    def test_reshuffle_resets_count(self):
+        shoe = Shoe(num_decks=1, penetration=0.5, seed=5)
+        for _ in range(30):
+            shoe.draw()
+        shoe.start_round()
+        assert shoe.running_count == 0
+        assert shoe.composition == shoe_composition(1)
+
+    def test_single_deck_start_round_resets_count(self):
+        deck = Deck(seed=5)
+        deck.draw()
+        deck.start_round()
+        assert deck.running_count == 0
+        assert len(deck.cards) == 52
+
+    def test_recount_after_replacing_cards(self):
+        deck = Deck()
+        deck.cards = [Card("2", 2)]
+        deck.recount()
+        assert deck.composition == (0, 1, 0, 0, 0, 0, 0, 0, 0, 0)
+        # Every card but one low card has been dealt
+        assert deck.running_count == -1
+
+    def test_hidden_card_is_counted_when_revealed(self):
+        shoe = Shoe(num_decks=2, seed=4)
+        seen = [shoe.draw() for _ in range(5)]
+        hole = shoe.draw_hidden()
+        assert shoe.running_count == _hi_lo(seen)
+        assert shoe.hidden == (hole,)
+
+        shoe.reveal(hole)
+        assert shoe.running_count == _hi_lo(seen + [hole])
+        assert shoe.hidden == ()
+
+    def test_next_round_counts_unrevealed_cards(self):
+        shoe = Shoe(num_decks=2, seed=4)
+        dealt = [shoe.draw(), shoe.draw_hidden()]
+        shoe.start_round()
+        assert shoe.running_count == _hi_lo(dealt)
+
+
+class TestGameCounting:
+    def test_hole_card_is_counted_after_dealer_plays(self):
+        from engine.game import BlackjackGame
+
+        game = BlackjackGame([("Alice", 10), ("Bob", 10)], shoe=Shoe(num_decks=6, seed=3))
+        hole = game.dealer_hand.cards[1]
+        seen = [c for p in game.players for c in p.hands[0].hand.cards] + game.dealer_hand.cards[:1]
+        assert game.deck.running_count == _hi_lo(seen)
+
+        for player in game.players:
+            if not player.hands[0].is_finished:
+                game.stand(player, 0)
+        game.play_dealer()
+        assert game.deck.running_count == _hi_lo(seen + game.dealer_hand.cards[1:])
+        assert hole not in game.deck.hidden
+
+
+def test_true_count_helper():
+    assert true_count(6, 156) == pytest.approx(2.0)
+    assert true_count(3, 0) == 0.0
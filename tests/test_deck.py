@@ -1,4 +1,5 @@
-from engine.deck import Deck
+import pytest
+from engine.deck import Deck, Shoe
 
 
 def test_deck_create_has_52_unique_cards():
@@ -31,3 +32,99 @@ def test_all_expected_ranks_and_suits_present():
     assert any("Jack" in n for n in names)
     assert any("10 of" in n for n in names)
 
+
+
+def test_shoe_holds_all_decks():
+    shoe = Shoe(num_decks=6)
+    assert len(shoe.cards) == 312
+    names = [c.name for c in shoe.cards]
+    assert names.count("Ace of Spades") == 6
+
+
+def test_shoe_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        Shoe(num_decks=0)
+    with pytest.raises(ValueError):
+        Shoe(penetration=0)
+    with pytest.raises(ValueError):
+        Shoe(penetration=1.5)
+
+
+def test_shoe_does_not_reshuffle_before_cut_card():
+    shoe = Shoe(num_decks=1, penetration=0.5)
+    shoe.draw()
+    remaining = list(shoe.cards)
+    shoe.start_round()
+    assert shoe.cards == remaining
+
+
+def test_shoe_reshuffles_after_cut_card():
+    shoe = Shoe(num_decks=1, penetration=0.5)
+    for _ in range(26):
+        shoe.draw()
+    assert shoe.cut_card_reached is True
+    shoe.start_round()
+    assert len(shoe.cards) == 52
+    assert shoe.cut_card_reached is False
+
+
+def test_shoe_run_dry_deals_only_discards():
+    shoe = Shoe(num_decks=1, penetration=1.0, seed=3)
+    for _ in range(48):
+        shoe.draw()
+    shoe.start_round()
+    in_play = [shoe.draw() for _ in range(4)]
+    assert shoe.cards == []
+
+    refilled = [shoe.draw() for _ in range(10)]
+    assert len(shoe.cards) == 38
+    assert not {c.id for c in refilled} & {c.id for c in in_play}
+    # The next round starts from a full shoe again
+    shoe.start_round()
+    assert len(shoe.cards) == 52
+
+
+def test_shoe_rejects_round_using_every_card():
+    shoe = Shoe(num_decks=1, penetration=1.0)
+    for _ in range(52):
+        shoe.draw()
+    with pytest.raises(ValueError):
+        shoe.draw()
+
+
+def test_lazy_deck_deals_same_sequence_as_full_shuffle():
+    eager = Deck(seed=2024)
+    lazy = Deck(seed=2024, lazy=True)
+    eager_cards = [eager.draw() for _ in range(52)]
+    lazy_cards = [lazy.draw() for _ in range(52)]
+    assert lazy_cards == eager_cards
+
+
+def test_lazy_deck_deals_every_card_once():
+    deck = Deck(lazy=True)
+    drawn = [deck.draw() for _ in range(52)]
+    assert len({c.name for c in drawn}) == 52
+    assert deck.cards == []
+
+
+def test_lazy_deck_card_frequencies_are_uniform():
+    # The top card of a lazily dealt deck should be any card equally often
+    counts = {}
+    trials = 52 * 400
+    for seed in range(trials):
+        card = Deck(seed=seed, lazy=True).draw()
+        counts[card.name] = counts.get(card.name, 0) + 1
+    assert len(counts) == 52
+    assert all(250 < n < 550 for n in counts.values())
+
+
+def test_lazy_shoe_matches_eager_shoe():
+    eager = Shoe(num_decks=6, penetration=0.5, seed=8)
+    lazy = Shoe(num_decks=6, penetration=0.5, seed=8, lazy=True)
+    eager_cards, lazy_cards = [], []
+    # Up to the cut card: after a reshuffle the two use their generators differently
+    for _ in range(19):
+        for shoe, dealt in ((eager, eager_cards), (lazy, lazy_cards)):
+            shoe.start_round()
+            dealt.extend(shoe.draw() for _ in range(8))
+    assert eager_cards == lazy_cards
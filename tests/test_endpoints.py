@@ -0,0 +1,301 @@
+"""
+In-process tests of the API endpoints, using FastAPI's TestClient
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.push import KEEPALIVE
+from backend.store import MemoryGameStore, SqliteGameStore
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def _start(client, **payload):
+    payload.setdefault("players", [{"name": "Alice", "bet": 100}])
+    return client.post("/api/game/start", json=payload)
+
+
+def _playable(client, monkeypatch, **payload):
+    """A game whose first player has a hard 10 and can still act."""
+    monkeypatch.setattr(main, "ALLOW_CLIENT_SEEDS", True)
+    return _start(client, seed=4, **payload).json()
+
+
+def _act(client, game, action, **payload):
+    payload.setdefault("player_index", 0)
+    return client.post(f"/api/game/{game['game_id']}/{action}", json={"game_id": game["game_id"], **payload})
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Records which functions were submitted to it."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.calls = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.calls.append(fn.__name__)
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestSeeds:
+    def test_client_seed_is_rejected_by_default(self, client, monkeypatch):
+        monkeypatch.setattr(main, "ALLOW_CLIENT_SEEDS", False)
+        assert _start(client, seed=42).status_code == 403
+
+    def test_client_seed_replays_when_allowed(self, client, monkeypatch):
+        monkeypatch.setattr(main, "ALLOW_CLIENT_SEEDS", True)
+        first, replay = _start(client, seed=42).json(), _start(client, seed=42).json()
+        assert first["players"] == replay["players"]
+        assert first["dealer_hand"] == replay["dealer_hand"]
+
+
+class TestAdvice:
+    def test_advice_runs_off_the_loop(self, client, monkeypatch):
+        executor = RecordingExecutor()
+        monkeypatch.setattr(main, "advice_executor", executor)
+        game_id = _start(client).json()["game_id"]
+        try:
+            response = client.get(f"/api/game/{game_id}/advice", params={"player_index": 0})
+        finally:
+            executor.shutdown()
+        assert response.status_code == 200
+        data = response.json()
+        assert data["best"] in data["ev"]
+        assert executor.calls == ["advise"]
+
+    def test_advice_for_missing_player(self, client):
+        game_id = _start(client).json()["game_id"]
+        response = client.get(f"/api/game/{game_id}/advice", params={"player_index": 5})
+        assert response.status_code == 400
+
+    def test_api_bounds_the_ev_caches(self):
+        from engine.advisor import EV_CACHE_SIZE, ev_cache_info, set_ev_cache_size
+        from engine.probability import DEALER_CACHE_SIZE, dealer_cache_info, set_dealer_cache_size
+
+        try:
+            with TestClient(main.app):
+                assert dealer_cache_info().maxsize == main.ADVICE_CACHE_SIZE
+                assert all(info.maxsize == main.ADVICE_CACHE_SIZE for info in ev_cache_info().values())
+        finally:
+            set_ev_cache_size(EV_CACHE_SIZE)
+            set_dealer_cache_size(DEALER_CACHE_SIZE)
+
+
+class TestRules:
+    def test_start_with_rules(self, client):
+        response = _start(client, rules={"num_decks": 6, "surrender": True, "blackjack_payout": [6, 5]})
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("rules", [
+        {"num_decks": 1_000_000},
+        {"num_decks": 0},
+        {"blackjack_payout": [3, 2, 1]},
+        {"blackjack_payout": [300, 2]},
+        {"double_on": [300]},
+        {"insurance_payout": 1000},
+        {"penetration": 0},
+    ])
+    def test_out_of_range_rules_are_rejected(self, client, rules):
+        assert _start(client, rules=rules).status_code == 422
+
+
+class TestSnapshotBounds:
+    @pytest.fixture
+    def sqlite_store(self, tmp_path, monkeypatch):
+        store = SqliteGameStore(str(tmp_path / "games.db"))
+        monkeypatch.setattr(main, "store", store)
+        yield store
+        store.close()
+
+    @pytest.mark.parametrize("payload", [
+        {"players": [{"name": "Alice", "bet": -5}]},
+        {"players": [{"name": "Alice", "bet": 1 << 32}]},
+        {"players": [{"name": "A" * 300, "bet": 100}]},
+        {"players": [{"name": "", "bet": 100}]},
+        {"players": []},
+        {"players": [{"name": f"P{i}", "bet": 10} for i in range(300)]},
+        {"rules": {"num_decks": 300}},
+        {"rules": {"double_on": [300]}},
+    ])
+    def test_input_the_snapshot_cannot_hold_is_rejected(self, client, sqlite_store, payload):
+        assert _start(client, **payload).status_code == 422
+
+    def test_largest_valid_game_is_saved(self, client, sqlite_store):
+        name = "Ł" * (main.MAX_NAME_LENGTH - 2)
+        players = [{"name": f"{name}{i:02d}", "bet": main.MAX_BET} for i in range(main.MAX_PLAYERS)]
+        response = _start(client, players=players, rules={"num_decks": main.MAX_DECKS})
+        assert response.status_code == 200
+
+    def test_unsaved_move_is_rolled_back(self, client, sqlite_store, monkeypatch):
+        game = _start(client).json()
+        game_id = game["game_id"]
+
+        encode = sqlite_store._encode
+        def fail(game_id, entry):
+            raise ValueError("does not fit")
+        monkeypatch.setattr(sqlite_store, "_encode", fail)
+        response = client.post(f"/api/game/{game_id}/hit", json={"game_id": game_id, "player_index": 0})
+        assert response.status_code == 500
+
+        monkeypatch.setattr(sqlite_store, "_encode", encode)
+        state = client.get(f"/api/game/{game_id}").json()
+        assert state["version"] == game["version"]
+        assert state["players"] == game["players"]
+
+
+class TestStorageOffTheLoop:
+    def test_rehydration_and_stats_run_in_a_worker(self, client, tmp_path, monkeypatch):
+        store = SqliteGameStore(str(tmp_path / "games.db"))
+        monkeypatch.setattr(main, "store", store)
+        calls = []
+        for name in ("get", "stats"):
+            method = getattr(store, name)
+            def record(*args, _method=method, _name=name):
+                calls.append((_name, asyncio._get_running_loop() is None))
+                return _method(*args)
+            monkeypatch.setattr(store, name, record)
+        try:
+            game_id = _start(client).json()["game_id"]
+            store.cache.remove(game_id)  # Evicted: the next request reads the database
+            assert client.get(f"/api/game/{game_id}").status_code == 200
+            assert client.get("/api/store/stats").json()["rehydrated"] == 1
+            assert calls == [("get", True), ("stats", True)]
+        finally:
+            store.close()
+
+
+class TestConditionalGet:
+    def test_current_etag_gets_304(self, client):
+        game_id = _start(client).json()["game_id"]
+        first = client.get(f"/api/game/{game_id}")
+        etag = first.headers["ETag"]
+        repeat = client.get(f"/api/game/{game_id}", headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+        assert repeat.content == b""
+        assert repeat.headers["ETag"] == etag
+
+    def test_change_invalidates_etag(self, client, monkeypatch):
+        game = _playable(client, monkeypatch)
+        etag = client.get(f"/api/game/{game['game_id']}").headers["ETag"]
+        assert _act(client, game, "hit").status_code == 200
+        changed = client.get(f"/api/game/{game['game_id']}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert len(changed.json()["players"][0]["hands"][0]["cards"]) == 3
+
+
+class TestDeltas:
+    def test_current_client_gets_a_delta(self, client, monkeypatch):
+        game = _playable(client, monkeypatch)
+        data = _act(client, game, "hit", since_version=game["version"]).json()
+        assert data["delta"] is True
+        assert data["since_version"] == game["version"]
+        assert data["version"] > game["version"]
+        [player] = data["players"]
+        assert player["index"] == 0 and player["hands_from"] == 0
+        assert len(player["hands"][0]["cards"]) == 3
+        assert "dealer_hand" not in data
+
+    def test_stale_client_gets_the_full_state(self, client, monkeypatch):
+        game = _playable(client, monkeypatch)
+        data = _act(client, game, "hit", since_version=game["version"] - 1).json()
+        assert "delta" not in data
+        assert data["dealer_hand"] and data["players"][0]["name"] == "Alice"
+
+    def test_no_version_gets_the_full_state(self, client, monkeypatch):
+        game = _playable(client, monkeypatch)
+        assert "delta" not in _act(client, game, "stand").json()
+
+
+class TestSurrender:
+    def test_surrender_with_rule(self, client, monkeypatch):
+        game = _playable(client, monkeypatch, rules={"surrender": True})
+        data = _act(client, game, "surrender").json()
+        hand = data["players"][0]["hands"][0]
+        assert hand["surrendered"] and hand["is_finished"]
+        assert data["game_over"]
+
+    def test_surrender_without_rule(self, client, monkeypatch):
+        game = _playable(client, monkeypatch)
+        assert _act(client, game, "surrender").status_code == 400
+
+
+class TestResolve:
+    def test_resolve_replays_the_same_bytes(self, client, monkeypatch):
+        game = _playable(client, monkeypatch)
+        _act(client, game, "stand")
+        first = client.post(f"/api/game/{game['game_id']}/resolve")
+        second = client.post(f"/api/game/{game['game_id']}/resolve")
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        data = first.json()
+        assert data["seed"] == 4
+        assert data["results"][0]["player_name"] == "Alice"
+        assert len(data["dealer_hand"]) >= 2
+
+
+class _OpenRequest:
+    """Stands in for a Request whose client never disconnects."""
+
+    async def is_disconnected(self):
+        return False
+
+
+class TestEvents:
+    def _stream(self, client, monkeypatch, game_id, **headers):
+        # TestClient reads a response to its end: drop the game to close it
+        monkeypatch.setattr(main, "KEEPALIVE_INTERVAL", 0.01)
+        timer = threading.Timer(0.2, main.store.remove, (game_id,))
+        timer.start()
+        try:
+            return client.get(f"/api/game/{game_id}/events", headers=headers)
+        finally:
+            timer.join()
+
+    def test_stream_starts_with_the_current_state(self, client, monkeypatch):
+        game = _start(client).json()
+        response = self._stream(client, monkeypatch, game["game_id"])
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frame, _, rest = response.content.partition(b"\n\n")
+        assert frame.startswith(b"id: %d\nevent: state\ndata: " % game["version"])
+        assert json.loads(frame.split(b"data: ", 1)[1])["players"] == game["players"]
+        assert rest.startswith(KEEPALIVE)
+
+    def test_current_client_gets_no_replay(self, client, monkeypatch):
+        game = _start(client).json()
+        response = self._stream(client, monkeypatch, game["game_id"], **{"Last-Event-ID": str(game["version"])})
+        assert response.content.startswith(KEEPALIVE)
+        assert b"event: state" not in response.content
+
+    def test_idle_stream_does_not_keep_its_game_alive(self, client, monkeypatch):
+        now = [0.0]
+        store = MemoryGameStore(idle_ttl=10, clock=lambda: now[0])
+        monkeypatch.setattr(main, "store", store)
+        monkeypatch.setattr(main, "KEEPALIVE_INTERVAL", 0.01)
+        game_id = _start(client).json()["game_id"]
+
+        async def run():
+            response = await main.game_events(game_id, _OpenRequest(), None)
+            frames = response.body_iterator
+            first = await frames.__anext__()
+            now[0] = 30
+            keepalive = await frames.__anext__()
+            # Only get() expires the idle game; that closes the stream
+            assert store.get(game_id) is None
+            rest = [frame async for frame in frames]
+            return first, keepalive, rest
+
+        first, keepalive, rest = asyncio.run(run())
+        assert first.startswith(b"id: ")
+        assert keepalive == KEEPALIVE
+        assert rest == []
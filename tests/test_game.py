@@ -1,6 +1,7 @@
 import pytest
 from engine.models import Card
 from engine.game import BlackjackGame
+from engine.deck import Shoe
 from engine.enums import TurnResult, GameResult
 
 
@@ -163,3 +164,58 @@ class TestBlackjackGame:
         assert "Alice" in outcomes_by_name
         assert len(outcomes_by_name["Alice"]) > 0
         assert outcomes_by_name["Alice"][0].result in GameResult
+
+    def test_game_reuses_shared_shoe(self):
+        shoe = Shoe(num_decks=2)
+        first = BlackjackGame([("Alice", 10)], shoe=shoe)
+        cards_left = len(shoe.cards)
+        second = BlackjackGame([("Alice", 10)], shoe=shoe)
+
+        assert first.deck is shoe
+        assert second.deck is shoe
+        assert len(shoe.cards) == cards_left - 4
+
+    def test_new_round_reuses_players_and_deals_fresh_hands(self):
+        game = BlackjackGame([("Alice", 10), ("Bob", 20)], shoe=Shoe(seed=4))
+        alice = game.players[0]
+        game.stand(alice, 0)
+        game.new_round([30, 40])
+
+        assert game.players[0] is alice
+        assert [p.hands[0].bet for p in game.players] == [30, 40]
+        assert all(len(p.hands[0].hand.cards) == 2 for p in game.players)
+        assert len(game.dealer_hand.cards) == 2
+
+    def test_new_round_requires_bet_per_player(self):
+        game = BlackjackGame([("Alice", 10)])
+        with pytest.raises(ValueError):
+            game.new_round([10, 20])
+
+    def test_new_round_refreshes_single_deck(self):
+        game = BlackjackGame([("Alice", 10)])
+        game.new_round([10])
+        assert len(game.deck.cards) == 48
+
+    def test_version_changes_with_every_move(self):
+        game = BlackjackGame([("Alice", 10), ("Bob", 20)], seed=6)
+        versions = [game.version]
+        game.stand(game.players[0], 0)
+        versions.append(game.version)
+        game.hit(game.players[1], 0)
+        versions.append(game.version)
+        game.play_dealer()
+        game.resolve_insurance()
+        game.resolve_bets()
+        versions.append(game.version)
+        game.new_round([10, 20])
+        versions.append(game.version)
+
+        assert versions == sorted(set(versions))
+
+    def test_failed_move_keeps_version(self):
+        game = BlackjackGame([("Alice", 10)], seed=6)
+        game.hit(game.players[0], 0)
+        version = game.version
+        with pytest.raises(ValueError):
+            game.double(game.players[0], 0)
+        assert game.version == version
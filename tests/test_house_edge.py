@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from engine import house_edge as house_edge_module
+from engine.house_edge import clear_memory_cache, compute_ev, house_edge
+from engine.rules import RuleSet
+
+
+@pytest.fixture(autouse=True)
+def fresh_memory_cache():
+    clear_memory_cache()
+    yield
+    clear_memory_cache()
+
+
+@pytest.fixture(scope="module")
+def single_deck_ev():
+    return compute_ev(RuleSet())
+
+
+class TestComputeEv:
+    def test_single_deck_edge_is_small(self, single_deck_ev):
+        # No peek costs the player; classic single-deck rules stay under 1%
+        assert -0.01 < single_deck_ev < 0.0
+
+    def test_six_to_five_costs_about_a_point(self, single_deck_ev):
+        # 0.3 units on ~4.8% naturals, lost only when the dealer stands
+        # without a natural: a busting dealer pays naturals even money
+        ev = compute_ev(RuleSet(blackjack_payout=(6, 5)))
+        assert single_deck_ev - ev == pytest.approx(0.0103, abs=0.001)
+
+    def test_rule_changes_move_the_edge_the_right_way(self, single_deck_ev):
+        assert compute_ev(RuleSet(dealer_hits_soft_17=True)) < single_deck_ev
+        assert compute_ev(RuleSet(double_after_split=False)) < single_deck_ev
+        assert compute_ev(RuleSet(surrender=True)) > single_deck_ev
+
+
+class TestHouseEdgeCache:
+    def test_result_is_stored_and_reused_across_processes(self, tmp_path, monkeypatch):
+        path = tmp_path / "edge.json"
+        rules = RuleSet()
+        first = house_edge(rules, cache_path=path)
+        assert first.house_edge == pytest.approx(-first.ev)
+        assert rules.fingerprint in next(iter(json.loads(path.read_text())))
+
+        # A fresh process only has the file; it must not recompute
+        clear_memory_cache()
+        monkeypatch.setattr(house_edge_module, "compute_ev", pytest.fail)
+        assert house_edge(rules, cache_path=path).ev == first.ev
+
+    def test_fingerprint_separates_rulesets(self):
+        assert RuleSet().fingerprint == RuleSet().fingerprint
+        assert RuleSet().fingerprint != RuleSet(surrender=True).fingerprint
+
+    def test_corrupt_cache_file_is_recomputed(self, tmp_path):
+        path = tmp_path / "edge.json"
+        path.write_text("{not json")
+        result = house_edge(RuleSet(), cache_path=path)
+        assert json.loads(path.read_text())
+        assert result.ev < 0
@@ -1,5 +1,8 @@
+import random
+
 import pytest
-from engine.models import Card, Hand
+from engine.cards import CARDS
+from engine.models import Card, Hand, BetHand, Player
 
 
 class TestHandValueCalculation:
@@ -63,3 +66,74 @@ class TestHandValueCalculation:
         assert hand.value == 0
         assert hand.is_blackjack is False
         assert hand.is_bust is False
+
+
+def _reference_value(cards):
+    total = sum(c.value for c in cards)
+    aces = sum(1 for c in cards if c.value == 11)
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total
+
+
+class TestHandRunningTotals:
+    def test_matches_full_recount_for_random_hands(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            hand = Hand()
+            for _ in range(rng.randint(1, 8)):
+                hand.add(rng.choice(CARDS))
+                expected = _reference_value(hand.cards)
+                assert hand.value == expected
+                assert hand.is_bust is (expected > 21)
+                assert hand.is_blackjack is (len(hand.cards) == 2 and expected == 21)
+
+    def test_soft_hand_detection(self):
+        hand = Hand()
+        hand.add(Card("Ace", 11))
+        hand.add(Card("6", 6))
+        assert hand.is_soft is True
+        hand.add(Card("10", 10))
+        assert hand.value == 17
+        assert hand.is_soft is False
+
+    def test_pair_detection(self):
+        hand = Hand()
+        hand.add(Card("8", 8))
+        assert hand.is_pair is False
+        hand.add(Card("8", 8))
+        assert hand.is_pair is True
+        hand.add(Card("2", 2))
+        assert hand.is_pair is False
+
+    def test_totals_follow_replaced_cards(self):
+        hand = Hand()
+        hand.add(Card("10", 10))
+        hand.add(Card("9", 9))
+        assert hand.value == 19
+        hand.cards = [Card("Ace", 11), Card("King", 10)]
+        assert hand.value == 21
+        assert hand.is_blackjack is True
+
+    def test_totals_follow_direct_appends(self):
+        hand = Hand(cards=[Card("8", 8)])
+        assert hand.value == 8
+        hand.cards.append(Card("Ace", 11))
+        assert hand.value == 19
+        hand.cards.append(Card("5", 5))
+        assert hand.value == 14
+        hand.cards.pop()
+        assert hand.value == 19
+
+
+class TestCompactModels:
+    def test_models_have_no_instance_dict(self):
+        bet_hand = BetHand(bet=10)
+        player = Player(name="Alice", hands=[bet_hand])
+        for obj in (Card("5", 5), bet_hand.hand, bet_hand, player):
+            assert not hasattr(obj, "__dict__")
+
+    def test_models_reject_unknown_attributes(self):
+        with pytest.raises(AttributeError):
+            Hand().colour = "red"
@@ -0,0 +1,53 @@
+import pytest
+from engine.parallel import run_parallel, shard_sizes
+from engine.simulation import PrecisionTarget
+from engine.strategy import dealer_strategy
+
+
+def test_shard_sizes_cover_all_rounds():
+    assert shard_sizes(10, 4) == [3, 3, 2, 2]
+    assert shard_sizes(3, 8) == [1, 1, 1]
+    assert sum(shard_sizes(1001, 64)) == 1001
+
+
+def test_result_does_not_depend_on_worker_count():
+    single = run_parallel(800, seed=5, shards=8, workers=1)
+    pooled = run_parallel(800, seed=5, shards=8, workers=2)
+
+    assert single.net == pooled.net
+    assert single.outcomes == pooled.outcomes
+    assert single.round_net == pooled.round_net
+    assert single.seed == pooled.seed == 5
+
+
+def test_merged_statistics_are_consistent():
+    result = run_parallel(600, strategy=dealer_strategy, bets=(10, 20), seed=9, shards=6, workers=1)
+    assert result.rounds == 600
+    assert result.round_net.count == 600
+    assert result.initial_wagered == 600 * 30
+    assert result.ev_per_round == pytest.approx(result.round_net.mean)
+    low, high = result.confidence_interval()
+    assert low <= result.ev_per_round <= high
+
+
+def test_early_stop_does_not_depend_on_worker_count():
+    target = PrecisionTarget(stderr=0.5, min_rounds=400)
+    seen = []
+    single = run_parallel(20_000, seed=2, shards=40, workers=1, target=target, progress=lambda r: seen.append(r.rounds))
+    pooled = run_parallel(20_000, seed=2, shards=40, workers=2, target=target)
+
+    assert single.target_reached and pooled.target_reached
+    assert single.rounds < 20_000
+    assert single.rounds == pooled.rounds
+    assert single.round_net == pooled.round_net
+    assert seen == sorted(seen) and seen[-1] == single.rounds
+
+
+def test_generates_seed_when_missing():
+    result = run_parallel(10, shards=2, workers=1)
+    assert isinstance(result.seed, int)
+
+
+def test_rejects_empty_run():
+    with pytest.raises(ValueError):
+        run_parallel(0)
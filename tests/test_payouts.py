@@ -1,7 +1,10 @@
+import random
+
 import pytest
-from engine.models import Card, Hand, BetHand
+from engine.models import Card, Hand, BetHand, Player
 from engine.payouts import PayoutResolver, HandOutcome
 from engine.enums import GameResult
+from engine.rules import RuleSet
 
 
 class TestPayoutResolver:
@@ -211,3 +214,40 @@ class TestPayoutResolver:
         outcome = pr.resolve_hand(player_hand, dealer_hand)
         # player 18 vs dealer 19 -> lose by doubled bet (-30)
         assert outcome == HandOutcome(GameResult.LOSE, -30)
+
+
+VALUES = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11]
+
+
+def _random_hand(rng, min_cards=2):
+    hand = Hand()
+    for _ in range(rng.randint(min_cards, 5)):
+        hand.add(Card("x", rng.choice(VALUES)))
+    return hand
+
+
+class TestSettleTable:
+    @pytest.mark.parametrize("rules", [
+        RuleSet(),
+        RuleSet(blackjack_payout=(6, 5), surrender=True),
+    ])
+    def test_matches_resolve_hand(self, rules):
+        rng = random.Random(12)
+        pr = PayoutResolver(rules)
+        for _ in range(3000):
+            dealer = _random_hand(rng)
+            players = []
+            for seat in range(rng.randint(1, 4)):
+                player = Player(f"P{seat}")
+                for _ in range(rng.randint(1, 3)):
+                    bet_hand = BetHand(hand=_random_hand(rng), bet=rng.choice([1, 5, 7, 10, 25]))
+                    bet_hand.surrendered = rules.surrender and rng.random() < 0.1
+                    player.hands.append(bet_hand)
+                players.append(player)
+
+            expected = [[pr.resolve_hand(bh, dealer) for bh in p.hands] for p in players]
+            assert pr.settle_table(players, dealer) == expected
+
+    def test_empty_table(self):
+        dealer = Hand(cards=[Card("10", 10), Card("7", 7)])
+        assert PayoutResolver().settle_table([], dealer) == []
@@ -0,0 +1,84 @@
+import itertools
+
+import pytest
+from engine.deck import Deck
+from engine.models import Card, Hand
+from engine.probability import (
+    BLACKJACK, BUST, DEALER_OUTCOMES,
+    composition_of, dealer_cache_info, dealer_probabilities,
+    remove_card, shoe_composition,
+)
+from engine.turns import TurnManager
+
+
+def _card(value):
+    return Card(str(value), value)
+
+
+def _dealer_outcome(hand):
+    if hand.is_bust:
+        return BUST
+    if hand.is_blackjack:
+        return BLACKJACK
+    return hand.value
+
+
+class TestCompositionHelpers:
+    def test_shoe_composition_counts(self):
+        comp = shoe_composition(6)
+        assert sum(comp) == 312
+        assert comp[0] == 24
+        assert comp[9] == 96
+
+    def test_composition_of_deck(self):
+        assert composition_of(Deck().cards) == shoe_composition(1)
+
+    def test_remove_card(self):
+        comp = remove_card(shoe_composition(1), 11)
+        assert comp[0] == 3
+        with pytest.raises(ValueError):
+            remove_card((0,) * 10, 5)
+
+
+class TestDealerProbabilities:
+    def test_probabilities_sum_to_one(self):
+        comp = shoe_composition(6)
+        for upcard in range(2, 12):
+            probs = dealer_probabilities(upcard, remove_card(comp, upcard))
+            assert set(probs) == set(DEALER_OUTCOMES)
+            assert sum(probs.values()) == pytest.approx(1.0)
+
+    def test_known_single_deck_bust_rate(self):
+        probs = dealer_probabilities(6, remove_card(shoe_composition(1), 6))
+        assert probs[BUST] == pytest.approx(0.4208, abs=1e-4)
+        assert probs[BLACKJACK] == 0.0
+
+    def test_matches_exhaustive_enumeration_with_turn_manager(self):
+        upcard = 6
+        remaining = [10, 10, 5, 11, 2, 9, 3]
+        counts = {}
+        tm = TurnManager()
+        orders = list(itertools.permutations(remaining))
+        for order in orders:
+            dealer = Hand(cards=[_card(upcard)])
+            deck = Deck()
+            deck.cards = [_card(v) for v in reversed(order)]
+            dealer.add(deck.draw())
+            tm.dealer_play(dealer, deck)
+            outcome = _dealer_outcome(dealer)
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+        probs = dealer_probabilities(upcard, composition_of(_card(v) for v in remaining))
+        for outcome in DEALER_OUTCOMES:
+            assert probs[outcome] == pytest.approx(counts.get(outcome, 0) / len(orders))
+
+    def test_repeated_queries_hit_the_cache(self):
+        comp = remove_card(shoe_composition(2), 9)
+        dealer_probabilities(9, comp)
+        hits = dealer_cache_info().hits
+        dealer_probabilities(9, comp)
+        assert dealer_cache_info().hits == hits + 1
+
+    def test_empty_composition_is_rejected(self):
+        with pytest.raises(ValueError):
+            dealer_probabilities(5, (0,) * 10)
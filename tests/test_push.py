@@ -0,0 +1,55 @@
+import asyncio
+
+from backend.push import StateFeed, sse_frame
+
+
+def test_sse_frame_format():
+    assert sse_frame(3, b'{"a":1}') == b'id: 3\nevent: state\ndata: {"a":1}\n\n'
+
+
+def test_publish_shares_one_frame_with_every_subscriber():
+    async def run():
+        feed = StateFeed()
+        first, second = feed.subscribe(), feed.subscribe()
+        frame = sse_frame(1, b"{}")
+        feed.publish(frame)
+        return await first.next(1), await second.next(1), feed.published
+
+    first, second, published = asyncio.run(run())
+    assert first is second
+    assert published == 1
+
+
+def test_slow_subscriber_only_gets_newest_frame():
+    async def run():
+        feed = StateFeed()
+        subscription = feed.subscribe()
+        for version in range(3):
+            feed.publish(sse_frame(version, b"{}"))
+        return await subscription.next(1), await subscription.next(0.01)
+
+    newest, idle = asyncio.run(run())
+    assert newest.startswith(b"id: 2\n")
+    assert idle is None
+
+
+def test_unsubscribed_streams_get_nothing():
+    async def run():
+        feed = StateFeed()
+        subscription = feed.subscribe()
+        feed.unsubscribe(subscription)
+        feed.publish(sse_frame(1, b"{}"))
+        return len(feed), await subscription.next(0.01)
+
+    assert asyncio.run(run()) == (0, None)
+
+
+def test_close_ends_every_subscription():
+    async def run():
+        feed = StateFeed()
+        subscription = feed.subscribe()
+        feed.close()
+        frame = await subscription.next(1)
+        return frame, subscription.closed, len(feed)
+
+    assert asyncio.run(run()) == (None, True, 0)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+from engine.deck import Deck, Shoe
+from engine.game import BlackjackGame
+from engine.rng import make_rng, spawn_seeds
+
+
+def test_same_seed_gives_same_deck_order():
+    assert Deck(seed=42).cards == Deck(seed=42).cards
+
+
+def test_different_seeds_give_different_orders():
+    assert Deck(seed=1).cards != Deck(seed=2).cards
+
+
+def test_deck_without_seed_records_generated_seed():
+    deck = Deck()
+    assert isinstance(deck.seed, int)
+    assert Deck(seed=deck.seed).cards == deck.cards
+
+
+def test_deck_accepts_generator_object():
+    deck = Deck(rng=random.Random(5))
+    assert deck.seed is None
+    assert deck.cards == Deck(rng=random.Random(5)).cards
+
+
+def test_make_rng_rejects_seed_and_generator():
+    with pytest.raises(ValueError):
+        make_rng(seed=1, rng=random.Random())
+
+
+def test_shoe_reshuffles_reproducibly():
+    a = Shoe(num_decks=2, penetration=0.5, seed=9)
+    b = Shoe(num_decks=2, penetration=0.5, seed=9)
+    drawn_a, drawn_b = [], []
+    for _ in range(15):
+        for shoe, drawn in ((a, drawn_a), (b, drawn_b)):
+            shoe.start_round()
+            drawn.extend(shoe.draw() for _ in range(10))
+    assert drawn_a == drawn_b
+
+
+def test_game_replays_bit_for_bit():
+    first = BlackjackGame([("Alice", 10), ("Bob", 20)], seed=1234)
+    replay = BlackjackGame([("Alice", 10), ("Bob", 20)], seed=first.seed)
+    assert first.seed == 1234
+    assert first.dealer_hand.cards == replay.dealer_hand.cards
+    assert first.deck.cards == replay.deck.cards
+    for p1, p2 in zip(first.players, replay.players):
+        assert p1.hands[0].hand.cards == p2.hands[0].hand.cards
+
+
+def test_game_rejects_seed_with_shared_shoe():
+    with pytest.raises(ValueError):
+        BlackjackGame([("Alice", 10)], shoe=Shoe(), seed=1)
+
+
+def test_spawned_seeds_are_deterministic_and_distinct():
+    seeds = spawn_seeds(99, 64)
+    assert seeds == spawn_seeds(99, 64)
+    assert len(set(seeds)) == 64
+    assert spawn_seeds(100, 4) != seeds[:4]
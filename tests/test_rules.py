@@ -0,0 +1,185 @@
+import itertools
+
+import pytest
+from engine.deck import Deck, Shoe
+from engine.enums import Action, GameResult, TurnResult
+from engine.game import MANAGER_CACHE_SIZE, BlackjackGame, _managers
+from engine.models import BetHand, Card, Hand, Player
+from engine.payouts import HandOutcome, PayoutResolver
+from engine.probability import BLACKJACK, BUST, DEALER_OUTCOMES, composition_of, dealer_probabilities
+from engine.rules import DEFAULT_RULES, RuleSet
+from engine.simulation import RoundSimulator
+from engine.split import SplitManager
+from engine.turns import TurnManager
+
+
+def _card(value):
+    return Card(str(value), value)
+
+
+def _bet_hand(*values, bet=10):
+    return BetHand(hand=Hand(cards=[_card(v) for v in values]), bet=bet)
+
+
+def _deck(*values):
+    deck = Deck()
+    deck.cards = [_card(v) for v in reversed(values)]
+    return deck
+
+
+class TestRuleSet:
+    def test_defaults_match_classic_rules(self):
+        assert DEFAULT_RULES.blackjack_payout == (3, 2)
+        assert DEFAULT_RULES.blackjack_pays == 1.5
+        assert not DEFAULT_RULES.dealer_hits_soft_17
+        assert DEFAULT_RULES.num_decks == 1
+
+    @pytest.mark.parametrize("kwargs", [
+        {"blackjack_payout": (0, 2)},
+        {"num_decks": 0},
+        {"penetration": 1.5},
+        {"insurance_payout": -1},
+    ])
+    def test_invalid_rules_rejected(self, kwargs):
+        with pytest.raises(ValueError):
+            RuleSet(**kwargs)
+
+    def test_rules_are_hashable_and_normalized(self):
+        assert RuleSet(double_on=(11, 10, 10)) == RuleSet(double_on=(10, 11))
+        assert len({RuleSet(), RuleSet()}) == 1
+
+
+class TestRuleSpecializedManagers:
+    def test_six_to_five_blackjack(self):
+        resolver = PayoutResolver(RuleSet(blackjack_payout=(6, 5)))
+        outcome = resolver.resolve_hand(_bet_hand(11, 10, bet=10), _bet_hand(10, 9).hand)
+        assert outcome == HandOutcome(GameResult.BLACKJACK_WIN, 12)
+
+    def test_dealer_hits_soft_17(self):
+        dealer = Hand(cards=[_card(11), _card(6)])
+        TurnManager(RuleSet(dealer_hits_soft_17=True)).dealer_play(dealer, _deck(2))
+        assert dealer.value == 19
+
+        dealer = Hand(cards=[_card(11), _card(6)])
+        TurnManager().dealer_play(dealer, _deck(2))
+        assert dealer.value == 17
+
+    def test_hard_17_stands_under_h17(self):
+        dealer = Hand(cards=[_card(10), _card(7)])
+        TurnManager(RuleSet(dealer_hits_soft_17=True)).dealer_play(dealer, _deck(2))
+        assert dealer.value == 17
+
+    def test_no_double_after_split(self):
+        tm = TurnManager(RuleSet(double_after_split=False))
+        h1, _ = SplitManager().split(_bet_hand(8, 8))
+        h1.hand.add(_card(3))
+        assert tm.can_double(h1) is False
+        assert tm.can_double(_bet_hand(8, 3)) is True
+
+    def test_double_restricted_to_totals(self):
+        tm = TurnManager(RuleSet(double_on=(9, 10, 11)))
+        assert tm.can_double(_bet_hand(6, 4)) is True
+        assert tm.can_double(_bet_hand(6, 2)) is False
+        with pytest.raises(ValueError):
+            tm.double(_bet_hand(6, 2), _deck(5))
+
+    def test_surrender_forfeits_half_the_bet(self):
+        rules = RuleSet(surrender=True)
+        tm = TurnManager(rules)
+        bet_hand = _bet_hand(10, 6, bet=25)
+        assert tm.surrender(bet_hand) == TurnResult.SURRENDER
+        assert bet_hand.is_finished
+        outcome = PayoutResolver(rules).resolve_hand(bet_hand, _bet_hand(10, 10, 5).hand)
+        assert outcome.result == GameResult.SURRENDER
+        assert outcome.payout == -12
+
+    def test_surrender_loses_whole_bet_to_dealer_natural(self):
+        resolver = PayoutResolver(RuleSet(surrender=True))
+        bet_hand = _bet_hand(10, 6, bet=25)
+        bet_hand.surrendered = True
+        dealer = _bet_hand(11, 10).hand
+        outcome = resolver.resolve_hand(bet_hand, dealer)
+        assert outcome.result == GameResult.LOSE
+        assert outcome.payout == -25
+        assert resolver.settle_table([Player("P", [bet_hand])], dealer) == [[outcome]]
+
+    def test_surrender_not_offered_by_default(self):
+        with pytest.raises(ValueError):
+            TurnManager().surrender(_bet_hand(10, 6))
+
+    def test_insurance_payout_ratio(self):
+        rules = RuleSet(insurance_payout=3)
+        game = BlackjackGame([("P", 100)], seed=1, rules=rules)
+        game.players[0].insurance_bet = 10
+        assert game.insurance.resolve(game.players[0], True) == 30
+
+
+class TestGameRules:
+    def test_multi_deck_rules_deal_from_a_shoe(self):
+        game = BlackjackGame([("P", 10)], seed=3, rules=RuleSet(num_decks=6))
+        assert isinstance(game.deck, Shoe)
+        assert game.deck.num_decks == 6
+
+    def test_default_game_uses_a_single_deck(self):
+        game = BlackjackGame([("P", 10)], seed=3)
+        assert type(game.deck) is Deck
+        assert game.rules is DEFAULT_RULES
+
+    def test_games_share_compiled_managers_per_ruleset(self):
+        rules = RuleSet(dealer_hits_soft_17=True)
+        a = BlackjackGame([("P", 10)], rules=rules)
+        b = BlackjackGame([("P", 10)], rules=RuleSet(dealer_hits_soft_17=True))
+        assert a.turns is b.turns
+        assert a.turns is not BlackjackGame([("P", 10)]).turns
+
+    def test_compiled_managers_are_bounded(self):
+        for i in range(MANAGER_CACHE_SIZE + 20):
+            BlackjackGame([("P", 10)], rules=RuleSet(penetration=0.5 + i / 1000))
+        assert _managers.cache_info().currsize <= MANAGER_CACHE_SIZE
+
+    def test_game_surrender_advances_turn(self):
+        game = BlackjackGame([("P", 10)], seed=11, rules=RuleSet(surrender=True))
+        player = game.players[0]
+        if player.hands[0].is_finished:
+            pytest.skip("Seed dealt a natural")
+        game.surrender(player, 0)
+        assert game.current_player_index is None
+        game.play_dealer()
+        [[outcome]] = game.resolve_bets()
+        assert outcome.result == GameResult.SURRENDER
+        assert player.balance == 995
+
+    def test_advisor_offers_surrender(self):
+        game = BlackjackGame([("P", 10)], seed=11, rules=RuleSet(surrender=True))
+        advice = game.advise(game.players[0], 0)
+        upcard = game.dealer_hand.cards[0].value
+        p_natural = dealer_probabilities(upcard, game.advisor.unseen_composition(game))[BLACKJACK]
+        assert advice.ev[Action.SURRENDER] == pytest.approx(-0.5 - 0.5 * p_natural)
+
+
+class TestRuleAwareAnalysis:
+    def test_h17_probabilities_match_enumeration(self):
+        upcard = 11
+        remaining = [6, 10, 2, 5, 11, 3, 9]
+        tm = TurnManager(RuleSet(dealer_hits_soft_17=True))
+        counts = {}
+        orders = list(itertools.permutations(remaining))
+        for order in orders:
+            dealer = Hand(cards=[_card(upcard)])
+            deck = _deck(*order)
+            dealer.add(deck.draw())
+            tm.dealer_play(dealer, deck)
+            outcome = BUST if dealer.is_bust else BLACKJACK if dealer.is_blackjack else dealer.value
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+        probs = dealer_probabilities(upcard, composition_of(_card(v) for v in remaining), hits_soft_17=True)
+        for outcome in DEALER_OUTCOMES:
+            assert probs[outcome] == pytest.approx(counts.get(outcome, 0) / len(orders))
+
+    def test_simulation_takes_rules(self):
+        rules = RuleSet(num_decks=2, blackjack_payout=(6, 5), surrender=True)
+        simulator = RoundSimulator(seed=5, rules=rules)
+        assert simulator.shoe.num_decks == 2
+        assert simulator.run(200).rounds == 200
+        with pytest.raises(ValueError):
+            RoundSimulator(num_decks=2, rules=rules)
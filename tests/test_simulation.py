@@ -0,0 +1,120 @@
+import pytest
+from engine.enums import Action
+from engine.game import BlackjackGame
+from engine.simulation import PrecisionTarget, RoundSimulator, play_round
+from engine.strategy import dealer_strategy
+
+
+def _always_stand(bet_hand, upcard, game):
+    return Action.STAND
+
+
+class TestPlayRound:
+    def test_finishes_every_hand(self):
+        game = BlackjackGame([("Alice", 10), ("Bob", 20)], seed=3)
+        insurance_results, bet_results = play_round(game, dealer_strategy)
+
+        assert game.current_player_index is None
+        assert set(insurance_results) == {"Alice", "Bob"}
+        assert len(bet_results) == 2
+        assert game.dealer_hand.value >= 17
+
+    def test_applies_payouts_to_balances(self):
+        game = BlackjackGame([("Alice", 10)], seed=11)
+        insurance_results, bet_results = play_round(game, _always_stand)
+        net = sum(o.payout for o in bet_results[0]) + insurance_results["Alice"]
+        assert game.players[0].balance == 1000 + net
+
+    def test_places_insurance_when_offered(self):
+        placed = []
+
+        def take_insurance(player, game):
+            placed.append(player.name)
+            return player.hands[0].bet // 2
+
+        for seed in range(200):
+            game = BlackjackGame([("Alice", 10)], seed=seed)
+            if game.dealer_hand.cards[0].value == 11:
+                insurance_results, _ = play_round(game, _always_stand, take_insurance)
+                assert insurance_results["Alice"] in (10, -5)
+                break
+        assert placed == ["Alice"]
+
+    def test_rejects_unknown_action(self):
+        game = BlackjackGame([("Alice", 10)], seed=5)
+        game.players[0].hands[0].is_finished = False
+        game.current_player_index = 0
+        with pytest.raises(ValueError):
+            play_round(game, lambda *args: "fold")
+
+
+class TestRoundSimulator:
+    def test_counts_rounds_and_outcomes(self):
+        result = RoundSimulator(seed=1).run(500)
+        assert result.rounds == 500
+        assert result.hands >= 500
+        assert sum(result.outcomes.values()) == result.hands
+        assert result.initial_wagered == 500 * 10
+        assert result.rounds_per_second > 0
+
+    def test_same_seed_is_reproducible(self):
+        a = RoundSimulator(seed=42, bets=(10, 25)).run(300)
+        b = RoundSimulator(seed=42, bets=(10, 25)).run(300)
+        assert a.net == b.net
+        assert a.outcomes == b.outcomes
+
+    def test_consecutive_runs_continue_the_shoe(self):
+        sim = RoundSimulator(seed=7)
+        first = sim.run(100)
+        second = sim.run(100)
+        assert first.rounds == second.rounds == 100
+
+    def test_net_matches_player_balances(self):
+        sim = RoundSimulator(seed=9, bets=(10, 10, 10))
+        result = sim.run(200)
+        balances = sum(p.balance - 1000 for p in sim.game.players)
+        assert balances == result.net
+
+    def test_rejects_empty_table(self):
+        with pytest.raises(ValueError):
+            RoundSimulator(bets=())
+
+
+class TestEarlyStopping:
+    def test_stops_once_stderr_target_is_met(self):
+        target = PrecisionTarget(stderr=0.03, per_unit=True)
+        result = RoundSimulator(seed=3).run(100_000, target=target)
+        assert result.target_reached
+        assert result.rounds < 100_000
+        assert result.rounds % 1000 == 0
+        assert result.stderr(per_unit=True) <= 0.03
+
+    def test_ci_width_target(self):
+        target = PrecisionTarget(ci_width=2.0, confidence=0.9)
+        result = RoundSimulator(seed=3).run(100_000, target=target, check_every=500)
+        low, high = result.confidence_interval(0.9)
+        assert result.target_reached
+        assert high - low <= 2.0
+
+    def test_runs_to_the_limit_when_target_is_out_of_reach(self):
+        result = RoundSimulator(seed=3).run(1500, target=PrecisionTarget(stderr=1e-6))
+        assert result.rounds == 1500
+        assert not result.target_reached
+
+    def test_chunked_run_matches_plain_run(self):
+        reports = []
+        chunked = RoundSimulator(seed=8).run(2500, progress=reports.append, check_every=1000)
+        plain = RoundSimulator(seed=8).run(2500)
+        assert chunked.net == plain.net
+        assert chunked.round_net == plain.round_net
+        assert len(reports) == 3
+        assert reports[-1] is chunked
+
+    def test_round_histogram_accounts_for_every_round(self):
+        result = RoundSimulator(seed=4, bets=(10, 5)).run(400)
+        assert sum(result.round_histogram.values()) == 400
+        assert sum(net * n for net, n in result.round_histogram.items()) == result.net
+
+    def test_target_needs_a_threshold(self):
+        with pytest.raises(ValueError):
+            PrecisionTarget()
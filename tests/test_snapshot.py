@@ -0,0 +1,82 @@
+import pytest
+from engine.deck import Shoe
+from engine.game import BlackjackGame
+from engine.models import Card
+from engine.rules import RuleSet
+from engine.snapshot import decode_game, encode_game
+
+
+def _state(game):
+    return (
+        [(p.name, p.balance, p.insurance_bet, p.hands) for p in game.players],
+        game.dealer_hand.cards,
+        game.current_player_index,
+        game.rules,
+        game.seed,
+        game.deck.cards,
+        game.deck.composition,
+        game.deck.running_count,
+        game.version,
+    )
+
+
+class TestSnapshot:
+    def test_round_trip(self):
+        game = BlackjackGame([("Alice", 10), ("Bob", 25)], seed=4)
+        game.players[1].balance = 777
+        restored = decode_game(encode_game(game))
+        assert _state(restored) == _state(game)
+
+    def test_restored_game_deals_the_same_cards(self):
+        game = BlackjackGame([("Alice", 10)], seed=8)
+        original = BlackjackGame([("Alice", 10)], seed=8)
+        restored = decode_game(encode_game(game))
+        assert [restored.deck.draw() for _ in range(20)] == [original.deck.draw() for _ in range(20)]
+
+    def test_mid_round_state_with_rules_and_splits(self):
+        rules = RuleSet(num_decks=2, blackjack_payout=(6, 5), surrender=True, double_on=(10, 11))
+        game = BlackjackGame([("Alice", 10)], seed=21, rules=rules)
+        player = game.players[0]
+        first = player.hands[0].hand.cards[0]
+        player.hands[0].hand.cards = [first, first]
+        game.split_hand(player, 0)
+        game.stand(player, 0)
+        player.insurance_bet = 5
+
+        restored = decode_game(encode_game(game))
+        assert _state(restored) == _state(game)
+        assert isinstance(restored.deck, Shoe)
+        assert restored.deck.cut_card == game.deck.cut_card
+        assert restored.turns is game.turns
+        assert all(h.is_split for h in restored.players[0].hands)
+
+    def test_resolving_restored_game_matches_original(self):
+        game = BlackjackGame([("Alice", 10), ("Bob", 10)], seed=30)
+        restored = decode_game(encode_game(game))
+        for g in (game, restored):
+            for player in g.players:
+                for i, bet_hand in enumerate(player.hands):
+                    if not bet_hand.is_finished:
+                        g.stand(player, i)
+            g.play_dealer()
+        assert restored.resolve_bets() == game.resolve_bets()
+
+    def test_snapshot_is_compact(self):
+        game = BlackjackGame([("Alice", 10), ("Bob", 25), ("Cara", 5)], seed=2)
+        assert len(encode_game(game)) < 200
+
+    def test_large_and_missing_seeds(self):
+        for seed in (None, 2**70, -5):
+            game = BlackjackGame([("Alice", 10)], seed=seed)
+            assert decode_game(encode_game(game)).seed == game.seed
+
+    def test_rejects_non_canonical_cards(self):
+        game = BlackjackGame([("Alice", 10)], seed=1)
+        game.dealer_hand.cards.append(Card("Joker", 10))
+        with pytest.raises(ValueError):
+            encode_game(game)
+
+    @pytest.mark.parametrize("data", [b"XX\x01", b"BJ\x09", b"BJ\x01\x00\x00"])
+    def test_rejects_bad_snapshots(self, data):
+        with pytest.raises(ValueError):
+            decode_game(data)
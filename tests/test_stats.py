@@ -0,0 +1,49 @@
+import random
+import statistics
+
+import pytest
+from engine.stats import RunningStats
+
+
+def _stats(values):
+    s = RunningStats()
+    for v in values:
+        s.add(v)
+    return s
+
+
+class TestRunningStats:
+    def test_matches_statistics_module(self):
+        values = [random.Random(i).gauss(0, 3) for i in range(500)]
+        s = _stats(values)
+        assert s.count == 500
+        assert s.mean == pytest.approx(statistics.fmean(values))
+        assert s.variance == pytest.approx(statistics.variance(values))
+
+    def test_merge_equals_single_pass(self):
+        values = [random.Random(i).randint(-20, 30) for i in range(1000)]
+        merged = _stats(values[:313])
+        merged.merge(_stats(values[313:]))
+        single = _stats(values)
+        assert merged.count == single.count
+        assert merged.mean == pytest.approx(single.mean)
+        assert merged.variance == pytest.approx(single.variance)
+
+    def test_merge_with_empty(self):
+        s = _stats([1, 2, 3])
+        s.merge(RunningStats())
+        empty = RunningStats()
+        empty.merge(s)
+        assert empty.count == 3
+        assert empty.mean == 2
+
+    def test_small_samples(self):
+        assert RunningStats().variance == 0.0
+        assert RunningStats().stderr == 0.0
+        assert _stats([5]).variance == 0.0
+
+    def test_confidence_interval_contains_mean(self):
+        s = _stats([random.Random(i).gauss(1, 1) for i in range(400)])
+        low, high = s.confidence_interval(0.95)
+        assert low < s.mean < high
+        assert high - low == pytest.approx(2 * 1.959964 * s.stderr, rel=1e-4)
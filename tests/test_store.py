@@ -0,0 +1,315 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from backend.store import MemoryGameStore, SqliteGameStore
+from engine.game import BlackjackGame
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _game():
+    return BlackjackGame([("P", 10)], seed=1)
+
+
+class TestMemoryGameStore:
+    def test_add_and_get(self):
+        store = MemoryGameStore()
+        game = _game()
+        entry = store.add("a", game)
+        assert store.get("a") is entry
+        assert entry.game is game
+        assert "a" in store and "b" not in store
+        assert store.get("b") is None
+
+    def test_least_recently_used_game_is_evicted(self):
+        store = MemoryGameStore(max_entries=2)
+        store.add("a", _game())
+        store.add("b", _game())
+        store.get("a")
+        store.add("c", _game())
+        assert "b" not in store
+        assert "a" in store and "c" in store
+        assert store.stats()["evicted_lru"] == 1
+
+    def test_idle_games_expire_on_access(self):
+        clock = FakeClock()
+        store = MemoryGameStore(idle_ttl=10, clock=clock)
+        store.add("a", _game())
+        clock.now = 5
+        assert store.get("a") is not None
+        clock.now = 14
+        assert store.get("a") is not None  # Last access was at 5
+        clock.now = 30
+        assert store.get("a") is None
+        assert store.stats()["evicted_idle"] == 1
+
+    def test_reap_drops_only_idle_games(self):
+        clock = FakeClock()
+        store = MemoryGameStore(idle_ttl=10, clock=clock)
+        store.add("old", _game())
+        clock.now = 8
+        store.add("new", _game())
+        clock.now = 15
+        assert store.reap() == 1
+        assert len(store) == 1
+        assert store.stats()["evicted_idle"] == 1
+
+    def test_resolve_state_is_evicted_with_the_game(self):
+        store = MemoryGameStore(max_entries=1)
+        entry = store.add("a", _game())
+        entry.resolve_response = b'{"results":[]}'
+        store.add("b", _game())
+        assert store.get("a") is None
+        fresh = store.add("a", _game())
+        assert fresh.resolve_response is None
+        assert fresh.lock is not entry.lock
+
+    def test_waiting_on_game_lock_does_not_block_other_games(self):
+        store = MemoryGameStore()
+        busy, other = store.add("a", _game()), store.add("b", _game())
+        order = []
+
+        async def hold():
+            async with busy.lock:
+                await asyncio.sleep(0.05)
+                order.append("a done")
+
+        async def wait():
+            async with busy.lock:
+                order.append("a waited")
+
+        async def run_other():
+            async with other.lock:
+                order.append("b")
+
+        async def run():
+            await asyncio.gather(hold(), wait(), run_other())
+
+        asyncio.run(run())
+        assert order == ["b", "a done", "a waited"]
+
+    def test_games_in_use_are_not_evicted(self):
+        clock = FakeClock()
+        store = MemoryGameStore(max_entries=1, idle_ttl=10, clock=clock)
+        busy = store.add("a", _game())
+        asyncio.run(busy.lock.acquire())
+        store.add("b", _game())
+        clock.now = 20
+        assert store.reap() == 1
+        assert store.get("a") is busy
+        assert not busy.closed
+
+        busy.lock.release()
+        store.add("c", _game())
+        assert store.get("a") is None
+        assert busy.closed
+
+    def test_background_reaper(self):
+        store = MemoryGameStore(idle_ttl=0.01)
+        store.add("a", _game())
+        store.start_reaper(interval=0.01)
+        try:
+            deadline = time.monotonic() + 2
+            while len(store) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            store.stop_reaper()
+        assert len(store) == 0
+
+    def test_remove(self):
+        store = MemoryGameStore()
+        store.add("a", _game())
+        assert store.remove("a") is True
+        assert store.remove("a") is False
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            MemoryGameStore(max_entries=0)
+
+
+    def test_peek_neither_touches_nor_expires(self):
+        clock = FakeClock()
+        store = MemoryGameStore(max_entries=2, idle_ttl=10, clock=clock)
+        entry = store.add("a", _game())
+        store.add("b", _game())
+        clock.now = 30
+        assert store.peek("a") is entry  # Idle, but only get() expires it
+        store.add("c", _game())
+        assert store.peek("a") is None  # Still least recently used
+        assert store.peek("missing") is None
+
+
+class FailingOnce:
+    """A connection whose first batch write fails, as on a locked database."""
+
+    def __init__(self, db, on_write=None):
+        self._db = db
+        self._on_write = on_write
+        self.failed = False
+
+    def executemany(self, sql, rows):
+        if not self.failed:
+            self.failed = True
+            if self._on_write is not None:
+                self._on_write()
+            raise sqlite3.OperationalError("database is locked")
+        return self._db.executemany(sql, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+class TestSqliteGameStore:
+    def _store(self, tmp_path, **kwargs):
+        kwargs.setdefault("flush_interval", 60)
+        return SqliteGameStore(str(tmp_path / "games.db"), **kwargs)
+
+    def test_games_survive_a_restart(self, tmp_path):
+        store = self._store(tmp_path)
+        game = _game()
+        entry = store.add("a", game)
+        game.hit(game.players[0], 0)
+        entry.resolve_response = b'{"seed":1}'
+        store.save("a", entry)
+        store.close()
+
+        reopened = self._store(tmp_path)
+        try:
+            assert reopened.rehydrated == 0  # Nothing is loaded up front
+            restored = reopened.get("a")
+            assert reopened.rehydrated == 1
+            assert restored.resolve_response == b'{"seed":1}'
+            assert len(restored.game.players[0].hands[0].hand.cards) == 3
+            assert restored.game.deck.draw() == game.deck.draw()
+            assert reopened.get("a") is restored
+        finally:
+            reopened.close()
+
+    def test_saves_are_batched_and_coalesced(self, tmp_path):
+        store = self._store(tmp_path)
+        try:
+            entries = [store.add(str(i), _game()) for i in range(5)]
+            for _ in range(3):
+                store.save("0", entries[0])
+            assert store.stats()["pending_writes"] == 5
+            assert store.flush() == 5
+            assert store.flush() == 0
+            assert store.stats()["stored"] == 5
+        finally:
+            store.close()
+
+    def test_writer_thread_flushes_in_the_background(self, tmp_path):
+        store = self._store(tmp_path, flush_interval=0.01)
+        try:
+            store.add("a", _game())
+            deadline = time.monotonic() + 2
+            while store.stats()["pending_writes"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert store.flushed == 1
+        finally:
+            store.close()
+
+    def test_failed_flush_is_retried(self, tmp_path):
+        store = self._store(tmp_path, flush_interval=0.01, retry_delay=0.01)
+        store._db = FailingOnce(store._db)
+        try:
+            store.add("a", _game())
+            deadline = time.monotonic() + 2
+            while not store.flushed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert store.flush_failures == 1
+            assert store._writer.is_alive()
+            assert store.stats()["stored"] == 1
+        finally:
+            store.close()
+
+    def test_failed_flush_keeps_newer_snapshots(self, tmp_path):
+        store = self._store(tmp_path)
+        try:
+            entry = store.add("a", _game())
+            store._db = FailingOnce(store._db, on_write=lambda: store.save("a", entry))
+            game = entry.game
+            game.hit(game.players[0], 0)
+            with pytest.raises(sqlite3.OperationalError):
+                store.flush()
+            assert store.flush() == 1
+            store.cache.remove("a")
+            restored = store.get("a").game
+            assert len(restored.players[0].hands[0].hand.cards) == 3
+        finally:
+            store.close()
+
+    def test_evicted_games_are_rehydrated(self, tmp_path):
+        store = self._store(tmp_path, cache=MemoryGameStore(max_entries=1))
+        try:
+            store.add("a", _game())
+            store.add("b", _game())  # Evicts "a" from memory before any flush
+            assert store.get("a") is not None
+            store.flush()
+            store.add("c", _game())
+            assert store.get("b") is not None
+            assert store.rehydrated == 2
+        finally:
+            store.close()
+
+    def test_rehydration_never_duplicates_a_game_in_use(self, tmp_path):
+        store = self._store(tmp_path, cache=MemoryGameStore(max_entries=1))
+        try:
+            entry = store.add("a", _game())
+            asyncio.run(entry.lock.acquire())
+            store.add("b", _game())
+            assert store.get("a") is entry
+            assert store.rehydrated == 0
+        finally:
+            store.close()
+
+    def test_remove_deletes_everywhere(self, tmp_path):
+        store = self._store(tmp_path)
+        try:
+            store.add("a", _game())
+            store.flush()
+            assert store.remove("a") is True
+            assert store.get("a") is None
+            assert len(store) == 0
+        finally:
+            store.close()
+
+    def test_reap_drops_expired_rows(self, tmp_path):
+        store = self._store(tmp_path, retention=-1)
+        try:
+            store.add("a", _game())
+            store.flush()
+            assert store.reap() == 1
+            assert store.stats()["stored"] == 0
+        finally:
+            store.close()
+
+    def test_database_uses_wal(self, tmp_path):
+        store = self._store(tmp_path)
+        try:
+            (mode,) = store._db.execute("PRAGMA journal_mode").fetchone()
+            assert mode == "wal"
+        finally:
+            store.close()
+
+    def test_peek_does_not_rehydrate(self, tmp_path):
+        store = self._store(tmp_path)
+        store.add("a", _game())
+        store.close()
+
+        reopened = self._store(tmp_path)
+        try:
+            assert reopened.peek("a") is None
+            assert reopened.rehydrated == 0
+            entry = reopened.get("a")
+            assert reopened.peek("a") is entry
+        finally:
+            reopened.close()
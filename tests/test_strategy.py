@@ -0,0 +1,49 @@
+from engine.enums import Action
+from engine.models import BetHand, Card
+from engine.strategy import basic_strategy, dealer_strategy
+
+
+def _bet_hand(*values):
+    bh = BetHand(bet=10)
+    for v in values:
+        bh.hand.add(Card(str(v), v))
+    return bh
+
+
+class TestBasicStrategy:
+    def test_stands_on_hard_17(self):
+        assert basic_strategy(_bet_hand(10, 7), Card("Ace", 11)) == Action.STAND
+
+    def test_hits_hard_16_against_10(self):
+        assert basic_strategy(_bet_hand(10, 6), Card("10", 10)) == Action.HIT
+
+    def test_stands_hard_13_against_6(self):
+        assert basic_strategy(_bet_hand(10, 3), Card("6", 6)) == Action.STAND
+
+    def test_doubles_11_against_10(self):
+        assert basic_strategy(_bet_hand(6, 5), Card("10", 10)) == Action.DOUBLE
+
+    def test_hits_when_double_not_possible(self):
+        assert basic_strategy(_bet_hand(3, 3, 5), Card("6", 6)) == Action.HIT
+
+    def test_soft_18_doubles_or_stands(self):
+        assert basic_strategy(_bet_hand(11, 7), Card("5", 5)) == Action.DOUBLE
+        assert basic_strategy(_bet_hand(11, 3, 4), Card("5", 5)) == Action.STAND
+        assert basic_strategy(_bet_hand(11, 7), Card("9", 9)) == Action.HIT
+
+    def test_always_splits_aces_and_eights(self):
+        for upcard in range(2, 12):
+            assert basic_strategy(_bet_hand(11, 11), Card("x", upcard)) == Action.SPLIT
+            assert basic_strategy(_bet_hand(8, 8), Card("x", upcard)) == Action.SPLIT
+
+    def test_never_splits_tens_or_fives(self):
+        assert basic_strategy(_bet_hand(10, 10), Card("6", 6)) == Action.STAND
+        assert basic_strategy(_bet_hand(5, 5), Card("6", 6)) == Action.DOUBLE
+
+
+class TestDealerStrategy:
+    def test_hits_below_17(self):
+        assert dealer_strategy(_bet_hand(10, 6), Card("2", 2)) == Action.HIT
+
+    def test_stands_on_17(self):
+        assert dealer_strategy(_bet_hand(10, 7), Card("2", 2)) == Action.STAND